@@ -14,18 +14,30 @@ Output:
 """
 
 import argparse
+import functools
 import re
 import sys
 import os
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, TextIO
 
-try:
-    import yaml
-except ImportError:
-    # Fallback to manual YAML output if pyyaml not installed
-    yaml = None
+# Agent Script line patterns (compiled once, matched against every line)
+START_AGENT_PATTERN = re.compile(r'start_agent\s+(\w+):')
+TOPIC_PATTERN = re.compile(r'topic\s+(\w+):')
+ACTION_NAME_PATTERN = re.compile(r'^(\w+):')
+IO_FIELD_PATTERN = re.compile(r'^(inp_\w+|out_\w+):')
+TRANSITION_PATTERN = re.compile(r'@utils\.transition\s+to\s+@topic\.(\w+)')
+
+# "key: value" fields copied verbatim from a line onto the matching attribute.
+# Lines are dispatched on the text before the first colon, so each lookup is
+# a single set membership test rather than a chain of startswith() calls.
+CONFIG_FIELDS = frozenset({'agent_name', 'agent_label', 'description'})
+ACTION_FIELDS = frozenset({'description', 'target'})
+
+# Line prefixes inside a topic's actions block that never start an action
+NON_ACTION_PREFIXES = ('description:', 'inputs:', 'outputs:', 'target:', 'inp_', 'out_',
+                       'reasoning:', 'instructions:', 'actions:', 'label:')
 
 
 @dataclass
@@ -37,6 +49,11 @@ class AgentAction:
     inputs: List[Dict] = field(default_factory=list)
     outputs: List[Dict] = field(default_factory=list)
 
+    @functools.cached_property
+    def description_lower(self) -> str:
+        """Lowercased description, computed once for utterance generation."""
+        return self.description.lower()
+
 
 @dataclass
 class AgentTopic:
@@ -48,6 +65,16 @@ class AgentTopic:
     actions: List[AgentAction] = field(default_factory=list)
     transitions: List[str] = field(default_factory=list)
 
+    @functools.cached_property
+    def label_lower(self) -> str:
+        """Lowercased label, computed once for utterance generation."""
+        return self.label.lower()
+
+    @functools.cached_property
+    def description_lower(self) -> str:
+        """Lowercased description, computed once for utterance generation."""
+        return self.description.lower()
+
 
 @dataclass
 class AgentStructure:
@@ -57,12 +84,29 @@ class AgentStructure:
     description: str = ""
     topics: List[AgentTopic] = field(default_factory=list)
 
+    def __post_init__(self):
+        # Name index for get_topic(). Set here rather than declared as a field
+        # so it stays out of __init__, repr, comparisons and asdict()
+        self._by_name: Dict[str, AgentTopic] = {}
+        # Index topics passed to the constructor, not just add_topic() ones
+        for topic in self.topics:
+            self._by_name.setdefault(topic.name, topic)
+
+    def add_topic(self, topic: AgentTopic) -> None:
+        """Append a topic and index it by name for get_topic."""
+        self.topics.append(topic)
+        # First definition wins, matching the order topics appear in the file
+        self._by_name.setdefault(topic.name, topic)
+
     def get_topic(self, name: str) -> Optional[AgentTopic]:
         """Get a topic by name."""
-        for topic in self.topics:
-            if topic.name == name:
-                return topic
-        return None
+        topic = self._by_name.get(name)
+        if topic is None:
+            # Topics appended to self.topics directly bypass the index
+            topic = next((t for t in self.topics if t.name == name), None)
+            if topic is not None:
+                self._by_name[name] = topic
+        return topic
 
 
 def parse_agent_file(file_path: str) -> AgentStructure:
@@ -76,143 +120,136 @@ def parse_agent_file(file_path: str) -> AgentStructure:
     """
     structure = AgentStructure()
 
-    with open(file_path, 'r') as f:
-        content = f.read()
-
-    lines = content.split('\n')
-
     current_block = None  # 'config', 'topic', 'actions', etc.
     current_topic: Optional[AgentTopic] = None
     current_action: Optional[AgentAction] = None
     current_indent = 0
     block_indent = 0
 
-    for line_num, line in enumerate(lines, 1):
-        # Skip empty lines and comments
-        stripped = line.strip()
-        if not stripped or stripped.startswith('#'):
-            continue
-
-        # Calculate indentation (tabs = 1 level, or count spaces)
-        raw_indent = len(line) - len(line.lstrip())
-        if '\t' in line[:raw_indent]:
-            indent_level = line[:raw_indent].count('\t')
-        else:
-            indent_level = raw_indent // 2  # Assume 2-space indent
-
-        # Parse config block
-        if stripped.startswith('config:'):
-            current_block = 'config'
-            block_indent = indent_level
-            continue
-
-        if current_block == 'config' and indent_level > block_indent:
-            if stripped.startswith('agent_name:'):
-                structure.agent_name = extract_value(stripped)
-            elif stripped.startswith('agent_label:'):
-                structure.agent_label = extract_value(stripped)
-            elif stripped.startswith('description:'):
-                structure.description = extract_value(stripped)
-
-        # Parse start_agent topic
-        if stripped.startswith('start_agent '):
-            match = re.match(r'start_agent\s+(\w+):', stripped)
-            if match:
-                topic_name = match.group(1)
-                current_topic = AgentTopic(name=topic_name, is_start_agent=True)
-                structure.topics.append(current_topic)
-                current_block = 'topic'
-                block_indent = indent_level
+    # Stream lines from the file rather than holding the content and a
+    # split copy of it in memory at once
+    with open(file_path, 'r') as f:
+        for line_num, line in enumerate((l.rstrip('\n') for l in f), 1):
+            # Skip empty lines and comments
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#'):
                 continue
 
-        # Parse regular topics
-        if stripped.startswith('topic ') and ':' in stripped:
-            match = re.match(r'topic\s+(\w+):', stripped)
-            if match:
-                topic_name = match.group(1)
-                current_topic = AgentTopic(name=topic_name)
-                structure.topics.append(current_topic)
-                current_block = 'topic'
+            # Calculate indentation (tabs = 1 level, or count spaces).
+            # Count tabs within the indent bounds directly - no prefix slice.
+            raw_indent = len(line) - len(line.lstrip())
+            tab_count = line.count('\t', 0, raw_indent)
+            indent_level = tab_count if tab_count else raw_indent // 2  # Assume 2-space indent
+
+            # Field name of a "key: value" line; None without a colon, so bare
+            # words never match a field (the old checks were startswith('key:'))
+            name, sep, _ = stripped.partition(':')
+            key = name if sep else None
+
+            # Parse config block
+            if key == 'config':
+                current_block = 'config'
                 block_indent = indent_level
-                current_action = None
                 continue
 
-        # Inside a topic
-        if current_block == 'topic' and current_topic:
-            if stripped.startswith('label:'):
-                current_topic.label = extract_value(stripped)
-            elif stripped.startswith('description:'):
-                if current_action:
-                    current_action.description = extract_value(stripped)
-                else:
-                    current_topic.description = extract_value(stripped)
-            elif stripped.startswith('actions:') and indent_level == block_indent + 1:
-                current_block = 'topic_actions'
-                continue
-            elif stripped.startswith('reasoning:'):
-                current_block = 'reasoning'
-                continue
+            if current_block == 'config' and indent_level > block_indent:
+                if key in CONFIG_FIELDS:
+                    setattr(structure, key, extract_value(stripped))
+
+            # Parse start_agent topic
+            if stripped.startswith('start_agent '):
+                match = START_AGENT_PATTERN.match(stripped)
+                if match:
+                    topic_name = match.group(1)
+                    current_topic = AgentTopic(name=topic_name, is_start_agent=True)
+                    structure.add_topic(current_topic)
+                    current_block = 'topic'
+                    block_indent = indent_level
+                    continue
 
-        # Inside topic actions block (where flow actions are defined)
-        if current_block == 'topic_actions' and current_topic:
-            # Check for action name definition (word followed by colon, possibly @ reference)
-            # Skip keywords that are not action names
-            skip_keywords = ('description:', 'inputs:', 'outputs:', 'target:', 'inp_', 'out_',
-                           'reasoning:', 'instructions:', 'actions:', 'label:')
-            if ':' in stripped and not stripped.startswith(skip_keywords):
-                action_match = re.match(r'^(\w+):', stripped)
-                if action_match:
-                    action_name = action_match.group(1)
-                    # Skip if this looks like a transition action (references @utils or @topic)
-                    if '@utils' in stripped or '@topic' in stripped:
-                        continue
-                    current_action = AgentAction(name=action_name)
-                    current_topic.actions.append(current_action)
+            # Parse regular topics
+            if stripped.startswith('topic ') and ':' in stripped:
+                match = TOPIC_PATTERN.match(stripped)
+                if match:
+                    topic_name = match.group(1)
+                    current_topic = AgentTopic(name=topic_name)
+                    structure.add_topic(current_topic)
+                    current_block = 'topic'
+                    block_indent = indent_level
+                    current_action = None
                     continue
 
-            # Check if we've exited the actions block (hit reasoning: at same or lower indent)
-            if stripped.startswith('reasoning:'):
-                current_block = 'reasoning'
-                current_action = None
-                continue
+            # Inside a topic
+            if current_block == 'topic' and current_topic:
+                if key == 'label':
+                    current_topic.label = extract_value(stripped)
+                elif key == 'description':
+                    if current_action:
+                        current_action.description = extract_value(stripped)
+                    else:
+                        current_topic.description = extract_value(stripped)
+                elif key == 'actions' and indent_level == block_indent + 1:
+                    current_block = 'topic_actions'
+                    continue
+                elif key == 'reasoning':
+                    current_block = 'reasoning'
+                    continue
 
-            if current_action:
-                if stripped.startswith('description:'):
-                    current_action.description = extract_value(stripped)
-                elif stripped.startswith('target:'):
-                    current_action.target = extract_value(stripped)
-                elif stripped.startswith('inputs:'):
-                    continue  # Will parse input fields
-                elif stripped.startswith('outputs:'):
-                    continue  # Will parse output fields
-                elif stripped.startswith('inp_') or stripped.startswith('out_'):
-                    # Input/output field
-                    field_match = re.match(r'^(inp_\w+|out_\w+):', stripped)
-                    if field_match:
-                        field_name = field_match.group(1)
-                        if field_name.startswith('inp_'):
-                            current_action.inputs.append({'name': field_name})
-                        else:
-                            current_action.outputs.append({'name': field_name})
-
-        # Inside reasoning block (where transitions are)
-        if current_block == 'reasoning' and current_topic:
-            if stripped.startswith('actions:'):
-                current_block = 'reasoning_actions'
-                continue
+            # Inside topic actions block (where flow actions are defined)
+            if current_block == 'topic_actions' and current_topic:
+                # Check for action name definition (word followed by colon, possibly @ reference)
+                # Skip keywords that are not action names
+                if ':' in stripped and not stripped.startswith(NON_ACTION_PREFIXES):
+                    action_match = ACTION_NAME_PATTERN.match(stripped)
+                    if action_match:
+                        action_name = action_match.group(1)
+                        # Skip if this looks like a transition action (references @utils or @topic)
+                        if '@utils' in stripped or '@topic' in stripped:
+                            continue
+                        current_action = AgentAction(name=action_name)
+                        current_topic.actions.append(current_action)
+                        continue
+
+                # Check if we've exited the actions block (hit reasoning: at same or lower indent)
+                if key == 'reasoning':
+                    current_block = 'reasoning'
+                    current_action = None
+                    continue
+
+                if current_action:
+                    if key in ACTION_FIELDS:
+                        setattr(current_action, key, extract_value(stripped))
+                    elif key == 'inputs' or key == 'outputs':
+                        continue  # Will parse input/output fields
+                    elif stripped.startswith('inp_') or stripped.startswith('out_'):
+                        # Input/output field
+                        field_match = IO_FIELD_PATTERN.match(stripped)
+                        if field_match:
+                            field_name = field_match.group(1)
+                            if field_name.startswith('inp_'):
+                                current_action.inputs.append({'name': field_name})
+                            else:
+                                current_action.outputs.append({'name': field_name})
+
+            # Inside reasoning block (where transitions are)
+            if current_block == 'reasoning' and current_topic:
+                if key == 'actions':
+                    current_block = 'reasoning_actions'
+                    continue
 
-        # Parse reasoning actions (transitions)
-        if current_block == 'reasoning_actions' and current_topic:
-            # Look for @utils.transition to @topic.name
-            transition_match = re.search(r'@utils\.transition\s+to\s+@topic\.(\w+)', stripped)
-            if transition_match:
-                current_topic.transitions.append(transition_match.group(1))
+            # Parse reasoning actions (transitions)
+            if current_block == 'reasoning_actions' and current_topic:
+                # Look for @utils.transition to @topic.name
+                transition_match = TRANSITION_PATTERN.search(stripped)
+                if transition_match:
+                    current_topic.transitions.append(transition_match.group(1))
 
     return structure
 
 
+@functools.lru_cache(maxsize=2048)
 def extract_value(line: str) -> str:
-    """Extract the value from a 'key: value' line."""
+    """Extract the value from a 'key: value' line (memoized - templates repeat lines)."""
     if ':' not in line:
         return ""
 
@@ -236,48 +273,41 @@ def generate_test_cases(structure: AgentStructure) -> List[Dict]:
     2. Action invocation - one case per action with flow:// target
     3. Edge cases - off-topic handling
     """
-    test_cases = []
-
-    # Find router topic (start_agent)
+    routing_tests = []
+    action_tests = []
     router_topic = None
-    for topic in structure.topics:
-        if topic.is_start_agent:
-            router_topic = topic
-            break
-
-    router_name = router_topic.name if router_topic else 'topic_selector'
 
-    # Generate topic routing tests
+    # Single pass over topics: find the router (start_agent) and collect
+    # routing and action tests side by side, preserving their original order
     for topic in structure.topics:
         if topic.is_start_agent:
-            continue  # Don't test the router itself
-
-        # Create utterance based on topic label/description
-        utterance = generate_utterance_for_topic(topic)
-
-        test_case = {
-            'utterance': utterance,
-            'expectation': {
-                'topic': topic.name,
-                'actionSequence': []
-            }
-        }
-        test_cases.append(test_case)
+            if router_topic is None:
+                router_topic = topic
+        else:
+            # Create utterance based on topic label/description
+            # (the router itself is not tested for routing)
+            routing_tests.append({
+                'utterance': generate_utterance_for_topic(topic),
+                'expectation': {
+                    'topic': topic.name,
+                    'actionSequence': []
+                }
+            })
 
-    # Generate action invocation tests
-    for topic in structure.topics:
+        # Generate action invocation tests
         for action in topic.actions:
             if action.target and action.target.startswith('flow://'):
-                utterance = generate_utterance_for_action(action, topic)
-
-                test_case = {
-                    'utterance': utterance,
+                action_tests.append({
+                    'utterance': generate_utterance_for_action(action, topic),
                     'expectation': {
                         'topic': topic.name,
                         'actionSequence': [action.name]
                     }
-                }
-                test_cases.append(test_case)
+                })
+
+    router_name = router_topic.name if router_topic else 'topic_selector'
+
+    test_cases = routing_tests + action_tests
 
     # Add edge case tests
     edge_cases = generate_edge_case_tests(router_name)
@@ -286,37 +316,38 @@ def generate_test_cases(structure: AgentStructure) -> List[Dict]:
     return test_cases
 
 
+# Topic routing utterances, checked in order: (label keywords, description keywords, utterance)
+TOPIC_UTTERANCES = (
+    (('faq',), ('faq',), "I have a question about your services"),
+    (('menu',), ('menu',), "What's on your menu?"),
+    (('book', 'search'), ('book',), "I'm looking for a book"),
+    (('order',), ('order',), "I want to check my order status"),
+    (('support',), ('support',), "I need help with an issue"),
+    (('account',), ('account',), "I want to update my account"),
+    (('billing', 'payment'), ('billing',), "I have a question about my bill"),
+)
+
+
 def generate_utterance_for_topic(topic: AgentTopic) -> str:
     """Generate a test utterance that should route to this topic."""
     # Use label/description to generate appropriate utterance
-    label = topic.label.lower() if topic.label else topic.name
-    desc = topic.description.lower() if topic.description else ""
+    label = topic.label_lower if topic.label else topic.name
+    desc = topic.description_lower
 
     # Common patterns
-    if 'faq' in label or 'faq' in desc:
-        return "I have a question about your services"
-    if 'menu' in label or 'menu' in desc:
-        return "What's on your menu?"
-    if 'book' in label or 'book' in desc or 'search' in label:
-        return "I'm looking for a book"
-    if 'order' in label or 'order' in desc:
-        return "I want to check my order status"
-    if 'support' in label or 'support' in desc:
-        return "I need help with an issue"
-    if 'account' in label or 'account' in desc:
-        return "I want to update my account"
-    if 'billing' in label or 'billing' in desc or 'payment' in label:
-        return "I have a question about my bill"
+    for label_words, desc_words, utterance in TOPIC_UTTERANCES:
+        if any(w in label for w in label_words) or any(w in desc for w in desc_words):
+            return utterance
 
     # Default: use description or label
     if topic.description:
-        return f"I need help with {topic.description.lower()}"
+        return f"I need help with {desc}"
     return f"I need help with {topic.label or topic.name}"
 
 
 def generate_utterance_for_action(action: AgentAction, topic: AgentTopic) -> str:
     """Generate a test utterance that should trigger this action."""
-    desc = action.description.lower() if action.description else action.name
+    desc = action.description_lower if action.description else action.name
 
     # Extract key verbs from description
     if 'search' in desc:
@@ -368,11 +399,12 @@ def generate_edge_case_tests(router_name: str) -> List[Dict]:
     ]
 
 
-def generate_test_spec(structure: AgentStructure, output_path: str) -> str:
+def generate_test_spec(structure: AgentStructure, output_path: str) -> List[Dict]:
     """
     Generate a YAML test spec file.
 
-    Returns the spec content as a string.
+    The YAML is streamed straight to the output file. Returns the generated
+    test cases.
     """
     test_cases = generate_test_cases(structure)
 
@@ -382,45 +414,52 @@ def generate_test_spec(structure: AgentStructure, output_path: str) -> str:
         'testCases': test_cases
     }
 
-    # Generate YAML content
-    if yaml:
-        content = yaml.dump(spec, default_flow_style=False, sort_keys=False, allow_unicode=True)
-    else:
-        content = manual_yaml_output(spec)
-
     # Write to file
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, 'w') as f:
-        f.write(content)
+    # Imported here so callers that only parse .agent files never load PyYAML
+    try:
+        import yaml
+    except ImportError:
+        # Fallback to manual YAML output if pyyaml not installed
+        yaml = None
 
-    return content
+    if yaml and not hasattr(yaml, 'CSafeDumper'):
+        print("Warning: PyYAML was built without libyaml, falling back to the much slower "
+              "pure-Python emitter", file=sys.stderr)
 
+    with open(output_file, 'w') as f:
+        if yaml:
+            # libyaml's C emitter when PyYAML was built with it, else pure Python
+            dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+            yaml.dump(spec, f, Dumper=dumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        else:
+            manual_yaml_output(spec, f)
+
+    return test_cases
 
-def manual_yaml_output(spec: Dict) -> str:
-    """Generate YAML output without pyyaml library."""
-    lines = []
 
-    lines.append(f"subjectType: {spec['subjectType']}")
-    lines.append(f"subjectName: {spec['subjectName']}")
-    lines.append("")
-    lines.append("testCases:")
+def manual_yaml_output(spec: Dict, fh: TextIO) -> None:
+    """Write YAML output to an open file without pyyaml library."""
+    fh.write(f"subjectType: {spec['subjectType']}\n")
+    fh.write(f"subjectName: {spec['subjectName']}\n")
+    fh.write("\n")
+    fh.write("testCases:")
 
+    # Each case opens with the newline ending the previous line, so the file
+    # has a blank line between cases and a single trailing newline
     for tc in spec['testCases']:
-        lines.append(f"  - utterance: \"{tc['utterance']}\"")
-        lines.append("    expectation:")
-        lines.append(f"      topic: {tc['expectation']['topic']}")
+        fh.write(f"\n  - utterance: \"{tc['utterance']}\"\n")
+        fh.write("    expectation:\n")
+        fh.write(f"      topic: {tc['expectation']['topic']}\n")
         actions = tc['expectation']['actionSequence']
         if actions:
-            lines.append("      actionSequence:")
+            fh.write("      actionSequence:\n")
             for action in actions:
-                lines.append(f"        - {action}")
+                fh.write(f"        - {action}\n")
         else:
-            lines.append("      actionSequence: []")
-        lines.append("")
-
-    return "\n".join(lines)
+            fh.write("      actionSequence: []\n")
 
 
 def print_summary(structure: AgentStructure, test_cases: List[Dict]) -> None:
@@ -518,14 +557,12 @@ Examples:
         structure.agent_name = agent_file.stem
 
     # Generate test spec
-    content = generate_test_spec(structure, args.output)
+    test_cases = generate_test_spec(structure, args.output)
 
     # Print summary
     if args.verbose:
-        test_cases = generate_test_cases(structure)
         print_summary(structure, test_cases)
     else:
-        test_cases = generate_test_cases(structure)
         print(f"Generated {len(test_cases)} test cases")
         print(f"Output: {args.output}")
 
@@ -17,28 +17,37 @@ Usage:
 Prerequisites:
     - Agent Testing Center must be enabled in org
     - sf CLI v2 with @salesforce/plugin-agent installed
-    - Python 3.8+ with pyyaml (optional, fallback exists)
+    - Python 3.8+ with pyyaml (optional, fallback exists; built with libyaml for fast spec output)
 """
 
 import argparse
+import contextlib
+import importlib.util
+import io
 import json
 import os
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Tuple
-
-# Import the test spec generator
-SCRIPT_DIR = Path(__file__).parent
-sys.path.insert(0, str(SCRIPT_DIR))
+from typing import List, Optional, Tuple
 
 try:
-    from generate_test_spec import parse_agent_file, generate_test_spec, generate_test_cases
+    # Optional: faster parsing of large `sf agent test run` JSON output
+    import orjson
 except ImportError:
-    # Fallback if module import fails
-    generate_test_spec = None
+    orjson = None
+
+# Directory holding generate-test-spec.py
+SCRIPT_DIR = Path(__file__).parent
+
+# Section dividers for the step banners and result summaries
+_DIV = "=" * 65
+_DIV_LIGHT = "-" * 65
 
 
 def run_command(cmd: list, capture_output: bool = True) -> Tuple[int, str, str]:
@@ -57,35 +66,148 @@ def run_command(cmd: list, capture_output: bool = True) -> Tuple[int, str, str]:
         return -1, "", str(e)
 
 
-def check_agent_testing_center(target_org: str) -> bool:
-    """Check if Agent Testing Center is enabled in the org."""
-    print("=" * 65)
-    print("STEP 1: Checking Agent Testing Center Availability")
-    print("=" * 65)
+def stream_command(cmd: list, timeout: int, echo: bool = True) -> Tuple[int, str, str]:
+    """
+    Run a command, echoing its stderr progress as it arrives instead of when
+    it exits. Returns (exit_code, stdout, stderr) like run_command().
 
-    cmd = ['sf', 'agent', 'test', 'list', '--target-org', target_org, '--json']
-    exit_code, stdout, stderr = run_command(cmd)
+    stdout is only captured: for `--result-format json` runs it is the result
+    blob, which is parsed and summarized rather than dumped on the console.
+    With echo=False stderr is only captured too, for commands that run
+    concurrently and would otherwise interleave on the console.
+    """
+    # Own process group on POSIX so a timeout also kills the CLI's children,
+    # which would otherwise keep the pipes open
+    new_group = hasattr(os, 'killpg')
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1,
+                                start_new_session=new_group)
+    except Exception as e:
+        return -1, "", str(e)
+
+    def kill():
+        try:
+            if new_group:
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except OSError:
+            pass
+
+    # stderr is drained on its own thread so neither pipe can fill up and block
+    stderr_lines = []
+
+    def drain_stderr():
+        for line in proc.stderr:
+            if echo:
+                sys.stderr.write(line)
+            stderr_lines.append(line)
+
+    stderr_reader = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_reader.start()
+
+    timed_out = threading.Event()
+
+    def on_timeout():
+        timed_out.set()
+        kill()
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.start()
+    try:
+        stdout = proc.stdout.read()
+        proc.wait()
+        stderr_reader.join()
+    except BaseException:
+        # e.g. Ctrl-C: don't leave the CLI running in its own session
+        kill()
+        raise
+    finally:
+        timer.cancel()
+
+    if timed_out.is_set():
+        return -1, "", f"Command timed out after {timeout // 60} minutes"
+    return proc.returncode, stdout, ''.join(stderr_lines)
+
+
+def loads_json(text: str):
+    """
+    Parse JSON with orjson when installed, else the stdlib json module.
+    Raises json.JSONDecodeError either way.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson rejects a few inputs json accepts (NaN, >64-bit ints)
+            pass
+    return json.loads(text)
+
+
+def write_lines(lines: List[str]) -> None:
+    """Write a block of report lines to stdout with a single write call."""
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def has_any(haystacks: Tuple[str, ...], needles: Tuple[str, ...]) -> bool:
+    """Check each captured stream for any needle without concatenating them."""
+    return any(needle in haystack for haystack in haystacks for needle in needles)
+
+
+def testing_center_check_cmd(target_org: str) -> list:
+    """Command used to probe Agent Testing Center availability."""
+    return ['sf', 'agent', 'test', 'list', '--target-org', target_org, '--json']
+
+
+def check_agent_testing_center(target_org: str, check_result: Optional[Tuple[int, str, str]] = None) -> bool:
+    """
+    Check if Agent Testing Center is enabled in the org.
+
+    check_result is the run_command() result of testing_center_check_cmd()
+    when the caller already ran it (e.g. in the background).
+    """
+    if check_result is None:
+        check_result = run_command(testing_center_check_cmd(target_org))
+    exit_code, stdout, stderr = check_result
+
+    lines = [
+        _DIV,
+        "STEP 1: Checking Agent Testing Center Availability",
+        _DIV,
+    ]
 
     if exit_code == 0:
-        print("   Agent Testing Center is ENABLED")
+        lines.append("   Agent Testing Center is ENABLED")
+        write_lines(lines)
         return True
 
     # Check for specific error messages
-    combined_output = stdout + stderr
-    if 'INVALID_TYPE' in combined_output or 'Not available' in combined_output:
-        print("   Agent Testing Center is NOT ENABLED")
-        print("")
-        print("   To enable Agent Testing Center:")
-        print("   - Contact Salesforce support or your account team")
-        print("   - May require: Agentforce Service Agent license or Einstein Platform license")
-        print("")
+    if has_any((stdout, stderr), ('INVALID_TYPE', 'Not available')):
+        lines.extend([
+            "   Agent Testing Center is NOT ENABLED",
+            "",
+            "   To enable Agent Testing Center:",
+            "   - Contact Salesforce support or your account team",
+            "   - May require: Agentforce Service Agent license or Einstein Platform license",
+            "",
+        ])
+        write_lines(lines)
         return False
 
     # Other error
-    print(f"   Warning: Could not determine status. Error: {stderr[:100]}")
+    lines.append(f"   Warning: Could not determine status. Error: {stderr[:100]}")
+    write_lines(lines)
     return False
 
 
+def first_agent_file(dir_path: Path) -> Optional[Path]:
+    """
+    Return the first .agent file in dir_path without listing the rest.
+    A missing directory simply yields no match.
+    """
+    return next(dir_path.glob('*.agent'), None)
+
+
 def find_agent_file(agent_name: str, agent_dir: Optional[str], agent_file: Optional[str]) -> Optional[Path]:
     """Find the .agent file to test."""
     if agent_file:
@@ -97,39 +219,57 @@ def find_agent_file(agent_name: str, agent_dir: Optional[str], agent_file: Optio
 
     if agent_dir:
         dir_path = Path(agent_dir)
-        agent_files = list(dir_path.glob('*.agent'))
-        if agent_files:
-            return agent_files[0]
+        first = first_agent_file(dir_path)
+        if first:
+            return first
 
         # Try looking in standard DX structure
-        bundle_path = dir_path / 'force-app/main/default/aiAuthoringBundles' / agent_name
-        if bundle_path.exists():
-            agent_files = list(bundle_path.glob('*.agent'))
-            if agent_files:
-                return agent_files[0]
+        first = first_agent_file(dir_path / 'force-app/main/default/aiAuthoringBundles' / agent_name)
+        if first:
+            return first
 
         print(f"Error: No .agent file found in {agent_dir}")
         return None
 
     # Try current directory DX structure
     cwd = Path.cwd()
-    bundle_path = cwd / 'force-app/main/default/aiAuthoringBundles' / agent_name
-    if bundle_path.exists():
-        agent_files = list(bundle_path.glob('*.agent'))
-        if agent_files:
-            return agent_files[0]
+    first = first_agent_file(cwd / 'force-app/main/default/aiAuthoringBundles' / agent_name)
+    if first:
+        return first
 
     print(f"Error: Could not find agent file for {agent_name}")
     return None
 
 
+def load_spec_generator():
+    """
+    Import generate-test-spec.py in-process for the fallback path.
+
+    The hyphenated file name can't be imported by module name, so it is
+    loaded from its path. Returns None if it can't be loaded.
+    """
+    spec_script = SCRIPT_DIR / 'generate-test-spec.py'
+    try:
+        spec = importlib.util.spec_from_file_location('generate_test_spec', spec_script)
+        module = importlib.util.module_from_spec(spec)
+        # Registered first so dataclasses can resolve the module while it executes
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        return module
+    except (ImportError, OSError):
+        sys.modules.pop('generate_test_spec', None)
+        return None
+
+
 def generate_test_spec_file(agent_file: Path, output_dir: Path, agent_name: str) -> Optional[Path]:
     """Generate test spec YAML file from agent definition."""
-    print("")
-    print("=" * 65)
-    print("STEP 2: Generating Test Spec from Agent Definition")
-    print("=" * 65)
-    print(f"   Agent file: {agent_file}")
+    write_lines([
+        "",
+        _DIV,
+        "STEP 2: Generating Test Spec from Agent Definition",
+        _DIV,
+        f"   Agent file: {agent_file}",
+    ])
 
     output_path = output_dir / f"{agent_name}-testSpec.yaml"
 
@@ -142,19 +282,25 @@ def generate_test_spec_file(agent_file: Path, output_dir: Path, agent_name: str)
             '--output', str(output_path),
             '--verbose'
         ]
-        exit_code, stdout, stderr = run_command(cmd, capture_output=False)
+        exit_code, stdout, stderr = run_command(cmd)
+        # Captured rather than inherited so it lands in order with our own output
+        if stdout:
+            sys.stdout.write(stdout)
+        if stderr:
+            sys.stderr.write(stderr)
 
         if exit_code == 0 and output_path.exists():
             print(f"   Generated: {output_path}")
             return output_path
 
-    # Fallback: try direct import
-    if generate_test_spec:
+    # Fallback: import the generator only now that the subprocess path failed
+    generator = load_spec_generator()
+    if generator:
         try:
-            structure = parse_agent_file(str(agent_file))
+            structure = generator.parse_agent_file(str(agent_file))
             if not structure.agent_name:
                 structure.agent_name = agent_name
-            generate_test_spec(structure, str(output_path))
+            generator.generate_test_spec(structure, str(output_path))
             print(f"   Generated: {output_path}")
             return output_path
         except Exception as e:
@@ -166,13 +312,15 @@ def generate_test_spec_file(agent_file: Path, output_dir: Path, agent_name: str)
 
 def create_test_in_org(spec_file: Path, test_name: str, target_org: str) -> bool:
     """Create test definition in org using sf agent test create."""
-    print("")
-    print("=" * 65)
-    print("STEP 3: Creating Test Definition in Org")
-    print("=" * 65)
-    print(f"   Spec file: {spec_file}")
-    print(f"   Test name: {test_name}")
-    print(f"   Target org: {target_org}")
+    write_lines([
+        "",
+        _DIV,
+        "STEP 3: Creating Test Definition in Org",
+        _DIV,
+        f"   Spec file: {spec_file}",
+        f"   Test name: {test_name}",
+        f"   Target org: {target_org}",
+    ])
 
     cmd = [
         'sf', 'agent', 'test', 'create',
@@ -189,13 +337,14 @@ def create_test_in_org(spec_file: Path, test_name: str, target_org: str) -> bool
         return True
 
     # Check for specific errors
-    combined = stdout + stderr
-    if 'INVALID_TYPE' in combined or 'Not available' in combined:
-        print("   Error: Agent Testing Center not available")
-        print("   Run 'sf agent test list' to verify access")
+    if has_any((stdout, stderr), ('INVALID_TYPE', 'Not available')):
+        write_lines([
+            "   Error: Agent Testing Center not available",
+            "   Run 'sf agent test list' to verify access",
+        ])
         return False
 
-    if 'already exists' in combined.lower():
+    if has_any((stdout.lower(), stderr.lower()), ('already exists',)):
         print("   Test definition already exists - will use existing")
         return True
 
@@ -203,18 +352,71 @@ def create_test_in_org(spec_file: Path, test_name: str, target_org: str) -> bool
     return False
 
 
-def run_tests(test_name: str, target_org: str, wait_minutes: int = 10) -> Tuple[bool, str]:
-    """Run agent tests and return results."""
-    print("")
-    print("=" * 65)
-    print("STEP 4: Running Agent Tests")
-    print("=" * 65)
-    print(f"   Test name: {test_name}")
-    print(f"   Wait timeout: {wait_minutes} minutes")
-    print("")
-    print("   Running tests (this may take a few minutes)...")
+def load_spec(spec_file: Path) -> Optional[dict]:
+    """Load a test spec for sharding, or None when pyyaml isn't installed."""
+    try:
+        import yaml
+    except ImportError:
+        print("   Warning: pyyaml is required to shard tests, running unsharded")
+        return None
 
-    cmd = [
+    with open(spec_file) as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+
+
+def shard_slices(case_count: int, shards: int) -> List[slice]:
+    """
+    Contiguous test case slices for up to `shards` shards, so merged results
+    keep the spec's test order. Returns [] when there is nothing to split.
+    """
+    shards = min(shards, case_count)
+    if shards <= 1:
+        return []
+    chunk = -(-case_count // shards)
+    return [slice(i, i + chunk) for i in range(0, case_count, chunk)]
+
+
+def count_shards(spec_file: Path, shards: int) -> int:
+    """Number of shard definitions shard_test_spec() creates for this spec."""
+    spec = load_spec(spec_file)
+    if spec is None:
+        return 0
+    return len(shard_slices(len(spec.get('testCases') or []), shards))
+
+
+def shard_test_spec(spec_file: Path, shards: int) -> List[Path]:
+    """
+    Split a test spec into up to `shards` spec files with disjoint test cases.
+
+    `sf agent test run` can't filter test cases, so each shard becomes its
+    own test definition. Returns [] when the spec can't or needn't be split.
+    """
+    spec = load_spec(spec_file)
+    if spec is None:
+        return []
+
+    test_cases = spec.get('testCases') or []
+    slices = shard_slices(len(test_cases), shards)
+    if not slices:
+        return []
+
+    import yaml
+    dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    shard_files = []
+    for part in slices:
+        shard_file = spec_file.with_name(f"{spec_file.stem}-{len(shard_files) + 1}{spec_file.suffix}")
+        with open(shard_file, 'w') as f:
+            yaml.dump(dict(spec, testCases=test_cases[part]), f, Dumper=dumper,
+                      default_flow_style=False, sort_keys=False, allow_unicode=True)
+        shard_files.append(shard_file)
+
+    print(f"   Sharded into {len(shard_files)} specs of up to {slices[0].stop} test cases")
+    return shard_files
+
+
+def test_run_cmd(test_name: str, target_org: str, wait_minutes: int) -> list:
+    """Command that runs one test definition with JSON output."""
+    return [
         'sf', 'agent', 'test', 'run',
         '--api-name', test_name,
         '--wait', str(wait_minutes),
@@ -222,34 +424,114 @@ def run_tests(test_name: str, target_org: str, wait_minutes: int = 10) -> Tuple[
         '--target-org', target_org
     ]
 
-    exit_code, stdout, stderr = run_command(cmd)
+
+def run_tests(test_name: str, target_org: str, wait_minutes: int = 10) -> Tuple[bool, str]:
+    """Run agent tests and return results."""
+    write_lines([
+        "",
+        _DIV,
+        "STEP 4: Running Agent Tests",
+        _DIV,
+        f"   Test name: {test_name}",
+        f"   Wait timeout: {wait_minutes} minutes",
+        "",
+        "   Running tests (this may take a few minutes)...",
+    ])
+
+    # Streamed so progress is visible; allow a minute past --wait for CLI start-up
+    exit_code, stdout, stderr = stream_command(test_run_cmd(test_name, target_org, wait_minutes),
+                                               timeout=(wait_minutes + 1) * 60)
 
     if exit_code == 0:
         print("   Tests completed")
         return True, stdout
 
-    print(f"   Tests may have failed or timed out")
-    print(f"   Exit code: {exit_code}")
+    write_lines([
+        "   Tests may have failed or timed out",
+        f"   Exit code: {exit_code}",
+    ])
 
     # Return whatever output we got for parsing
     return False, stdout if stdout else stderr
 
 
+def run_sharded_tests(test_names: List[str], target_org: str, wait_minutes: int = 10) -> Tuple[bool, str]:
+    """Run several test definitions concurrently and merge their test cases."""
+    write_lines([
+        "",
+        _DIV,
+        "STEP 4: Running Agent Tests",
+        _DIV,
+        f"   Test names: {', '.join(test_names)}",
+        f"   Wait timeout: {wait_minutes} minutes",
+        "",
+        f"   Running {len(test_names)} shards in parallel (this may take a few minutes)...",
+    ])
+
+    # Each shard is an sf CLI subprocess, so threads are enough to overlap them.
+    # Like run_tests(), allow a minute past --wait rather than run_command()'s 5
+    def run_shard(name: str) -> Tuple[int, str, str]:
+        return stream_command(test_run_cmd(name, target_org, wait_minutes),
+                              timeout=(wait_minutes + 1) * 60, echo=False)
+
+    with ThreadPoolExecutor(max_workers=len(test_names)) as executor:
+        results = list(executor.map(run_shard, test_names))
+
+    lines = []
+    merged = []
+    parsed_any = False
+    for name, (exit_code, stdout, stderr) in zip(test_names, results):
+        if exit_code != 0:
+            lines.append(f"   {name}: tests may have failed or timed out (exit code {exit_code})")
+        try:
+            data = loads_json(stdout if stdout else stderr)
+        except json.JSONDecodeError:
+            lines.append(f"   {name}: could not parse JSON output")
+            continue
+        result = data.get('result', data)
+        merged.extend(result.get('testCases', result.get('results', [])))
+        parsed_any = True
+
+    success = all(exit_code == 0 for exit_code, _, _ in results)
+    if success:
+        lines.append("   Tests completed")
+    write_lines(lines)
+
+    if not parsed_any:
+        # Return whatever output we got for parsing
+        exit_code, stdout, stderr = results[0]
+        return False, stdout if stdout else stderr
+
+    return success, json.dumps({'result': {'testCases': merged}})
+
+
+def truncate(text, limit: int):
+    """Shorten text to limit characters plus '...'; empty/None values pass through."""
+    if text and len(text) > limit:
+        return text[:limit] + '...'
+    return text
+
+
 def parse_and_display_results(output: str, agent_name: str) -> dict:
     """Parse test results and display formatted output."""
-    print("")
-    print("=" * 65)
-    print("STEP 5: Parsing and Displaying Results")
-    print("=" * 65)
+    lines = [
+        "",
+        _DIV,
+        "STEP 5: Parsing and Displaying Results",
+        _DIV,
+    ]
 
     # Try to parse as JSON
     try:
-        data = json.loads(output)
+        data = loads_json(output)
         result = data.get('result', data)
     except json.JSONDecodeError:
-        print("   Warning: Could not parse JSON output")
-        print("   Raw output:")
-        print(output[:500])
+        lines.extend([
+            "   Warning: Could not parse JSON output",
+            "   Raw output:",
+            output[:500],
+        ])
+        write_lines(lines)
         return {'passed': 0, 'failed': 0, 'total': 0}
 
     # Extract results
@@ -268,104 +550,117 @@ def parse_and_display_results(output: str, agent_name: str) -> dict:
             summary['passed'] += 1
         elif outcome in ['fail', 'failed', 'error']:
             summary['failed'] += 1
+            utterance = test.get('utterance', test.get('input', ''))
+            expected_actions = test.get('expectedActions', [])
+            actual_actions = test.get('actualActions', [])
+            error = test.get('errorMessage', test.get('message', ''))
             summary['failures'].append({
                 'name': test.get('name', test.get('testCaseName', 'Unknown')),
-                'utterance': test.get('utterance', test.get('input', '')),
+                'utterance': utterance,
                 'expected_topic': test.get('expectedTopic', ''),
                 'actual_topic': test.get('actualTopic', ''),
-                'expected_actions': test.get('expectedActions', []),
-                'actual_actions': test.get('actualActions', []),
-                'error': test.get('errorMessage', test.get('message', ''))
+                'expected_actions': expected_actions,
+                'actual_actions': actual_actions,
+                'error': error,
+                # Derived once here for the display loop and suggest_fixes()
+                'utterance_display': truncate(utterance, 60),
+                'error_display': truncate(error, 80),
+                'kind': 'action' if expected_actions and not actual_actions else 'topic',
             })
 
     summary['total'] = summary['passed'] + summary['failed']
 
     # Display results
-    print("")
     status_icon = "PASS" if summary['failed'] == 0 else "FAIL"
-    print(f"   {status_icon}: {summary['passed']}/{summary['total']} tests passed")
-    print("")
+    lines.extend([
+        "",
+        f"   {status_icon}: {summary['passed']}/{summary['total']} tests passed",
+        "",
+    ])
 
     if summary['failures']:
-        print("   FAILURES:")
-        print("   " + "-" * 60)
+        lines.append("   FAILURES:")
+        lines.append("   " + "-" * 60)
         for i, f in enumerate(summary['failures'], 1):
-            print(f"   {i}. {f['name']}")
+            lines.append(f"   {i}. {f['name']}")
             if f['utterance']:
-                utt = f['utterance'][:60] + '...' if len(f['utterance']) > 60 else f['utterance']
-                print(f"      Utterance: \"{utt}\"")
+                lines.append(f"      Utterance: \"{f['utterance_display']}\"")
             if f['expected_topic'] and f['actual_topic']:
-                print(f"      Expected topic: {f['expected_topic']}")
-                print(f"      Actual topic: {f['actual_topic']}")
+                lines.append(f"      Expected topic: {f['expected_topic']}")
+                lines.append(f"      Actual topic: {f['actual_topic']}")
             if f['error']:
-                err = f['error'][:80] + '...' if len(f['error']) > 80 else f['error']
-                print(f"      Error: {err}")
-            print("")
+                lines.append(f"      Error: {f['error_display']}")
+            lines.append("")
 
+    write_lines(lines)
     return summary
 
 
 def suggest_fixes(summary: dict, agent_name: str) -> None:
     """Suggest fixes for failing tests (enables agentic fix loop)."""
     if summary['failed'] == 0:
-        print("")
-        print("=" * 65)
-        print("ALL TESTS PASSED!")
-        print("=" * 65)
+        write_lines([
+            "",
+            _DIV,
+            "ALL TESTS PASSED!",
+            _DIV,
+        ])
         return
 
-    print("")
-    print("=" * 65)
-    print("AGENTIC FIX SUGGESTIONS")
-    print("=" * 65)
-    print("")
-
-    # Categorize failures
-    topic_failures = []
-    action_failures = []
-
-    for f in summary['failures']:
-        if f['expected_actions'] and not f['actual_actions']:
-            action_failures.append(f)
-        elif f['expected_topic'] != f['actual_topic']:
-            topic_failures.append(f)
-        else:
-            topic_failures.append(f)  # Default
+    lines = [
+        "",
+        _DIV,
+        "AGENTIC FIX SUGGESTIONS",
+        _DIV,
+        "",
+    ]
+
+    # Failures were categorized while parsing; anything not an action miss is a topic fix
+    topic_failures = [f for f in summary['failures'] if f['kind'] == 'topic']
+    action_failures = [f for f in summary['failures'] if f['kind'] == 'action']
 
     if topic_failures:
-        print("TOPIC ROUTING FIXES:")
-        print("-" * 65)
-        print("   The agent is routing utterances to wrong topics.")
-        print("")
-        print("   Suggested fix: Improve topic descriptions and scope.")
-        print("")
-        print("   Claude Code command:")
-        print(f"   Skill(skill=\"sf-ai-agentforce\", args=\"Fix topic routing for {agent_name}:")
+        lines.extend([
+            "TOPIC ROUTING FIXES:",
+            _DIV_LIGHT,
+            "   The agent is routing utterances to wrong topics.",
+            "",
+            "   Suggested fix: Improve topic descriptions and scope.",
+            "",
+            "   Claude Code command:",
+            f"   Skill(skill=\"sf-ai-agentforce\", args=\"Fix topic routing for {agent_name}:",
+        ])
         for f in topic_failures[:3]:  # Show first 3
-            print(f"     - Utterance '{f['utterance'][:40]}...' should route to {f['expected_topic']}\")")
-        print("")
+            lines.append(f"     - Utterance '{f['utterance'][:40]}...' should route to {f['expected_topic']}\")")
+        lines.append("")
 
     if action_failures:
-        print("ACTION INVOCATION FIXES:")
-        print("-" * 65)
-        print("   Expected actions were not invoked.")
-        print("")
-        print("   Suggested fix: Check action descriptions and trigger conditions.")
-        print("")
-        print("   Claude Code command:")
-        print(f"   Skill(skill=\"sf-ai-agentforce\", args=\"Fix action triggers for {agent_name}:")
+        lines.extend([
+            "ACTION INVOCATION FIXES:",
+            _DIV_LIGHT,
+            "   Expected actions were not invoked.",
+            "",
+            "   Suggested fix: Check action descriptions and trigger conditions.",
+            "",
+            "   Claude Code command:",
+            f"   Skill(skill=\"sf-ai-agentforce\", args=\"Fix action triggers for {agent_name}:",
+        ])
         for f in action_failures[:3]:
-            actions = ', '.join(f['expected_actions']) if f['expected_actions'] else 'actions'
-            print(f"     - Utterance should trigger {actions}\")")
-        print("")
-
-    print("NEXT STEPS:")
-    print("-" * 65)
-    print("   1. Apply the suggested fixes to the agent script")
-    print("   2. Re-validate: sf agent validate authoring-bundle --api-name", agent_name)
-    print("   3. Re-deploy: sf project deploy start --source-dir <agent-dir>")
-    print("   4. Re-run tests: python3 run-automated-tests.py --agent-name", agent_name, "...")
-    print("")
+            # Action failures always have expected actions
+            actions = ', '.join(f['expected_actions'])
+            lines.append(f"     - Utterance should trigger {actions}\")")
+        lines.append("")
+
+    lines.extend([
+        "NEXT STEPS:",
+        _DIV_LIGHT,
+        "   1. Apply the suggested fixes to the agent script",
+        f"   2. Re-validate: sf agent validate authoring-bundle --api-name {agent_name}",
+        "   3. Re-deploy: sf project deploy start --source-dir <agent-dir>",
+        f"   4. Re-run tests: python3 run-automated-tests.py --agent-name {agent_name} ...",
+        "",
+    ])
+    write_lines(lines)
 
 
 def main():
@@ -389,6 +684,10 @@ Examples:
   # Skip test creation (use existing test)
   python3 run-automated-tests.py --agent-name Coffee_Shop_FAQ_Agent \\
       --target-org MyOrg --skip-create
+
+  # Split tests into 4 test definitions run in parallel
+  python3 run-automated-tests.py --agent-name Coffee_Shop_FAQ_Agent \\
+      --agent-dir /path/to/project --target-org MyOrg --shards 4
         """
     )
 
@@ -400,50 +699,94 @@ Examples:
     parser.add_argument('--wait', type=int, default=10, help='Wait timeout in minutes (default: 10)')
     parser.add_argument('--skip-create', action='store_true', help='Skip test creation, use existing')
     parser.add_argument('--skip-check', action='store_true', help='Skip Agent Testing Center check')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='Split tests into N test definitions run in parallel '
+                             '(0 = CPU cores minus 2, default: 1)')
 
     args = parser.parse_args()
 
-    print("")
-    print("=" * 65)
-    print("AGENTFORCE AUTOMATED TESTING")
-    print("=" * 65)
-    print(f"Agent: {args.agent_name}")
-    print(f"Target Org: {args.target_org}")
-    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("")
-
-    # Step 1: Check Agent Testing Center
-    if not args.skip_check:
-        if not check_agent_testing_center(args.target_org):
-            print("")
-            print("FALLBACK: Use sf agent preview for manual testing:")
-            print(f"   sf agent preview --api-name {args.agent_name} --target-org {args.target_org}")
-            sys.exit(1)
-    else:
-        print("Skipping Agent Testing Center check (--skip-check)")
+    write_lines([
+        "",
+        _DIV,
+        "AGENTFORCE AUTOMATED TESTING",
+        _DIV,
+        f"Agent: {args.agent_name}",
+        f"Target Org: {args.target_org}",
+        f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+    ])
+
+    # Steps 1 and 2 have no data dependency: the sf CLI check runs in a worker
+    # thread while the spec is generated locally. Step 2 output is held back
+    # so the report still reads in step order.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        check = None
+        if not args.skip_check:
+            check = executor.submit(run_command, testing_center_check_cmd(args.target_org))
+
+        # Step 2: Generate test spec
+        step2_output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(step2_output):
+                agent_file = find_agent_file(args.agent_name, args.agent_dir, args.agent_file)
+                spec_file = None
+                if agent_file:
+                    output_dir = Path(args.output_dir) if args.output_dir else Path(tempfile.gettempdir()) / 'agentforce-tests'
+                    output_dir.mkdir(parents=True, exist_ok=True)
+                    spec_file = generate_test_spec_file(agent_file, output_dir, args.agent_name)
+        except BaseException:
+            # Show what step 2 printed before it failed; on success the
+            # output is written after step 1 instead
+            sys.stdout.write(step2_output.getvalue())
+            raise
+
+        # Step 1: Check Agent Testing Center
+        if check is not None:
+            if not check_agent_testing_center(args.target_org, check.result()):
+                write_lines([
+                    "",
+                    "FALLBACK: Use sf agent preview for manual testing:",
+                    f"   sf agent preview --api-name {args.agent_name} --target-org {args.target_org}",
+                ])
+                sys.exit(1)
+        else:
+            print("Skipping Agent Testing Center check (--skip-check)")
 
-    # Step 2: Generate test spec
-    agent_file = find_agent_file(args.agent_name, args.agent_dir, args.agent_file)
+    sys.stdout.write(step2_output.getvalue())
     if not agent_file:
         print("Error: Could not find agent file")
         sys.exit(1)
 
-    output_dir = Path(args.output_dir) if args.output_dir else Path(tempfile.gettempdir()) / 'agentforce-tests'
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    spec_file = generate_test_spec_file(agent_file, output_dir, args.agent_name)
     if not spec_file:
         print("Error: Could not generate test spec")
         sys.exit(1)
 
-    # Step 3: Create test in org
     test_name = f"{args.agent_name}_Tests"
+    shards = args.shards if args.shards > 0 else max(1, (os.cpu_count() or 1) - 2)
+    shard_names = []
+    if shards > 1:
+        if args.skip_create:
+            # Reuse shard definitions an earlier sharded run created from this
+            # spec; it may have made fewer than --shards if the spec is small
+            shard_names = [f"{test_name}_{i}" for i in range(1, count_shards(spec_file, shards) + 1)]
+        else:
+            shard_specs = shard_test_spec(spec_file, shards)
+            shard_names = [f"{test_name}_{i}" for i in range(1, len(shard_specs) + 1)]
+
+    # Step 3: Create test in org
     if not args.skip_create:
-        if not create_test_in_org(spec_file, test_name, args.target_org):
+        if shard_names:
+            for shard_spec, shard_name in zip(shard_specs, shard_names):
+                if not create_test_in_org(shard_spec, shard_name, args.target_org):
+                    print("Warning: Test creation failed, attempting to run existing test...")
+        elif not create_test_in_org(spec_file, test_name, args.target_org):
             print("Warning: Test creation failed, attempting to run existing test...")
 
     # Step 4: Run tests
-    success, output = run_tests(test_name, args.target_org, args.wait)
+    if shard_names:
+        success, output = run_sharded_tests(shard_names, args.target_org, args.wait)
+    else:
+        success, output = run_tests(test_name, args.target_org, args.wait)
 
     # Step 5: Parse and display results
     summary = parse_and_display_results(output, args.agent_name)
@@ -12,6 +12,10 @@ Categories:
 - Architecture (20 points)
 - Best Practices (15 points)
 - Documentation (10 points)
+
+Scores are cached under ~/.cache/sf-integration-validate/, keyed by a hash
+of the file name, file content and this script's mtime, so re-validating an
+unchanged file skips the scan. Only the most recently used entries are kept.
 """
 
 import sys
@@ -30,96 +34,171 @@ CATEGORIES = {
     'documentation': {'max': 10, 'score': 0, 'issues': []}
 }
 
-# File type patterns
-APEX_PATTERN = re.compile(r'\.cls$|\.trigger$')
-XML_PATTERN = re.compile(r'\.xml$')
-NAMED_CRED_PATTERN = re.compile(r'namedCredential.*\.xml$', re.IGNORECASE)
+# Report decoration per category (constant, so built once rather than per report)
+CATEGORY_ICONS = {
+    'security': '🔐',
+    'error_handling': '⚠️',
+    'bulkification': '📦',
+    'architecture': '🏗️',
+    'best_practices': '✅',
+    'documentation': '📝'
+}
+CATEGORY_LABELS = {name: name.replace('_', ' ').title() for name in CATEGORIES}
+
+# Scores are cached by content hash so unchanged files are not re-scanned
+CACHE_DIR = Path.home() / '.cache' / 'sf-integration-validate'
+CACHE_MAX_ENTRIES = 256  # Least recently used entries beyond this are pruned
+
+# File type suffixes (plain str.endswith checks, no regex needed per file)
+APEX_SUFFIXES = ('.cls', '.trigger')
+XML_SUFFIX = '.xml'
+NAMED_CRED_MARKER = 'namedcredential'  # matched case-insensitively before the .xml suffix
+PLATFORM_EVENT_MARKER = '__e.object-meta.xml'
+
+# Content patterns (compiled once at import, reused for every file)
+BEARER_TOKEN_PATTERN = re.compile(r'Authorization.*Bearer\s+[a-zA-Z0-9_\-]{20,}')
+API_KEY_PATTERN = re.compile(r'api[_-]?key\s*=\s*[\'"][a-zA-Z0-9]{10,}', re.IGNORECASE)
+PASSWORD_PATTERN = re.compile(r'password\s*=\s*[\'"][^\'"]{5,}', re.IGNORECASE)
+# Loop checks run in two phases (see loop_body_contains): find a for-loop
+# header, then search its body up to the next closing brace
+LOOP_HEADER_PATTERN = re.compile(r'for\s*\([^)]+\)\s*\{')
+LOOP_HEADER_PATTERN_I = re.compile(r'for\s*\([^)]+\)\s*\{', re.IGNORECASE)
+SOQL_PATTERN = re.compile(r'\[SELECT', re.IGNORECASE)
+DML_PATTERN = re.compile(r'(insert|update|delete)\s+', re.IGNORECASE)
+CALLOUT_PATTERN = re.compile(r'\.send\(')
+HTTP_METHOD_PATTERN = re.compile(r'setMethod\s*\(\s*[\'"](?:GET|POST|PUT|PATCH|DELETE)[\'"]\s*\)')
+CLASS_DOC_PATTERN = re.compile(r'/\*\*[\s\S]*?\*/\s*public\s+(with sharing\s+)?class')
+XML_PASSWORD_PATTERN = re.compile(r'<password>([^<]+)</password>')
+PROTOCOL_PATTERN = re.compile(r'<protocol>(\w+)</protocol>')
+EVENT_TYPE_PATTERN = re.compile(r'<eventType>(\w+)</eventType>')
+PUBLISH_BEHAVIOR_PATTERN = re.compile(r'<publishBehavior>(\w+)</publishBehavior>')
+
+
+def loop_body_contains(content: str, header_pattern, body_pattern) -> bool:
+    """
+    Check whether body_pattern occurs inside a for-loop body.
+
+    A body runs from the loop's '{' to the next '}' - the same span the
+    former single regex (header followed by [^}]*) covered. That regex
+    rescanned the shared text once per header when many loop headers
+    preceded one closing brace, which is quadratic. Here each stretch of
+    text is searched at most once: a header whose body starts inside an
+    already searched body cannot match anything new.
+    """
+    searched_to = -1
+    for header in header_pattern.finditer(content):
+        body_start = header.end()
+        if body_start <= searched_to:
+            continue
+        body_end = content.find('}', body_start)
+        if body_end == -1:
+            body_end = len(content)
+        if body_pattern.search(content, body_start, body_end):
+            return True
+        searched_to = body_end
+    return False
 
 
 def validate_apex_file(content: str, filename: str) -> None:
     """Validate Apex class/trigger for integration patterns."""
 
+    # Local handles on each category's issue list
+    security_issues = CATEGORIES['security']['issues']
+    error_handling_issues = CATEGORIES['error_handling']['issues']
+    bulkification_issues = CATEGORIES['bulkification']['issues']
+    architecture_issues = CATEGORIES['architecture']['issues']
+    best_practices_issues = CATEGORIES['best_practices']['issues']
+    documentation_issues = CATEGORIES['documentation']['issues']
+
+    # Markers consulted by several categories - scan for each only once
+    has_http_request = 'HttpRequest' in content
+    makes_callout = has_http_request or 'Http(' in content
+
     # Security checks (30 points)
     security_score = 30
 
     # Check for hardcoded credentials
-    if re.search(r'Authorization.*Bearer\s+[a-zA-Z0-9_\-]{20,}', content):
+    if BEARER_TOKEN_PATTERN.search(content):
         security_score -= 15
-        CATEGORIES['security']['issues'].append('❌ Hardcoded Bearer token detected')
+        security_issues.append('❌ Hardcoded Bearer token detected')
 
-    if re.search(r'api[_-]?key\s*=\s*[\'"][a-zA-Z0-9]{10,}', content, re.IGNORECASE):
+    if API_KEY_PATTERN.search(content):
         security_score -= 15
-        CATEGORIES['security']['issues'].append('❌ Hardcoded API key detected')
+        security_issues.append('❌ Hardcoded API key detected')
 
-    if re.search(r'password\s*=\s*[\'"][^\'"]{5,}', content, re.IGNORECASE):
+    if PASSWORD_PATTERN.search(content):
         security_score -= 15
-        CATEGORIES['security']['issues'].append('❌ Hardcoded password detected')
+        security_issues.append('❌ Hardcoded password detected')
 
     # Check for Named Credential usage
-    if 'HttpRequest' in content:
+    if has_http_request:
         if 'callout:' in content:
-            if not CATEGORIES['security']['issues']:
-                CATEGORIES['security']['issues'].append('✅ Named Credential used')
+            if not security_issues:
+                security_issues.append('✅ Named Credential used')
         else:
             security_score -= 10
-            CATEGORIES['security']['issues'].append('⚠️ HttpRequest without Named Credential')
+            security_issues.append('⚠️ HttpRequest without Named Credential')
 
     CATEGORIES['security']['score'] = max(0, security_score)
 
     # Error Handling checks (25 points)
     error_score = 25
 
-    if 'HttpRequest' in content or 'Http().send' in content:
+    if has_http_request or 'Http().send' in content:
         # Check for try-catch
         if 'try' not in content or 'catch' not in content:
             error_score -= 10
-            CATEGORIES['error_handling']['issues'].append('❌ Missing try-catch for callout')
+            error_handling_issues.append('❌ Missing try-catch for callout')
         else:
-            CATEGORIES['error_handling']['issues'].append('✅ Try-catch present')
+            error_handling_issues.append('✅ Try-catch present')
 
         # Check for CalloutException handling
         if 'CalloutException' in content:
-            CATEGORIES['error_handling']['issues'].append('✅ CalloutException handled')
+            error_handling_issues.append('✅ CalloutException handled')
         else:
             error_score -= 5
-            CATEGORIES['error_handling']['issues'].append('⚠️ CalloutException not explicitly caught')
+            error_handling_issues.append('⚠️ CalloutException not explicitly caught')
 
         # Check for status code handling
         if 'getStatusCode()' in content:
-            CATEGORIES['error_handling']['issues'].append('✅ Status code checked')
+            error_handling_issues.append('✅ Status code checked')
         else:
             error_score -= 5
-            CATEGORIES['error_handling']['issues'].append('⚠️ Status code not checked')
+            error_handling_issues.append('⚠️ Status code not checked')
 
         # Check for timeout setting
         if 'setTimeout' in content:
-            CATEGORIES['error_handling']['issues'].append('✅ Timeout configured')
+            error_handling_issues.append('✅ Timeout configured')
         else:
             error_score -= 5
-            CATEGORIES['error_handling']['issues'].append('⚠️ No timeout set (default may be too short)')
+            error_handling_issues.append('⚠️ No timeout set (default may be too short)')
 
     CATEGORIES['error_handling']['score'] = max(0, error_score)
 
     # Bulkification checks (20 points)
     bulk_score = 20
 
+    # The loop scans walk every loop header, so each is guarded by a search
+    # for its body pattern anywhere in the file. The case-insensitive guards
+    # reuse the compiled IGNORECASE patterns rather than lowercasing a copy.
+
     # Check for SOQL in loops
-    if re.search(r'for\s*\([^)]+\)\s*\{[^}]*\[SELECT', content, re.DOTALL | re.IGNORECASE):
+    if SOQL_PATTERN.search(content) and loop_body_contains(content, LOOP_HEADER_PATTERN_I, SOQL_PATTERN):
         bulk_score -= 10
-        CATEGORIES['bulkification']['issues'].append('❌ SOQL in loop')
+        bulkification_issues.append('❌ SOQL in loop')
 
     # Check for DML in loops
-    if re.search(r'for\s*\([^)]+\)\s*\{[^}]*(insert|update|delete)\s+', content, re.DOTALL | re.IGNORECASE):
+    if DML_PATTERN.search(content) and loop_body_contains(content, LOOP_HEADER_PATTERN_I, DML_PATTERN):
         bulk_score -= 10
-        CATEGORIES['bulkification']['issues'].append('❌ DML in loop')
+        bulkification_issues.append('❌ DML in loop')
 
     # Check for HTTP callout in loops (expensive)
-    if re.search(r'for\s*\([^)]+\)\s*\{[^}]*\.send\(', content, re.DOTALL):
+    if '.send(' in content and loop_body_contains(content, LOOP_HEADER_PATTERN, CALLOUT_PATTERN):
         bulk_score -= 5
-        CATEGORIES['bulkification']['issues'].append('⚠️ HTTP callout in loop (consider batching)')
+        bulkification_issues.append('⚠️ HTTP callout in loop (consider batching)')
 
     if bulk_score == 20:
-        CATEGORIES['bulkification']['issues'].append('✅ No obvious bulkification issues')
+        bulkification_issues.append('✅ No obvious bulkification issues')
 
     CATEGORIES['bulkification']['score'] = max(0, bulk_score)
 
@@ -128,17 +207,17 @@ def validate_apex_file(content: str, filename: str) -> None:
 
     # Check if class implements proper interfaces for callouts
     if 'implements Queueable' in content and 'Database.AllowsCallouts' in content:
-        CATEGORIES['architecture']['issues'].append('✅ Proper Queueable + AllowsCallouts pattern')
+        architecture_issues.append('✅ Proper Queueable + AllowsCallouts pattern')
     elif 'Queueable' in content and 'AllowsCallouts' not in content:
-        if 'HttpRequest' in content or 'Http(' in content:
+        if makes_callout:
             arch_score -= 10
-            CATEGORIES['architecture']['issues'].append('❌ Queueable with callout missing AllowsCallouts')
+            architecture_issues.append('❌ Queueable with callout missing AllowsCallouts')
 
     # Check for trigger context callout (should be async)
     if '.trigger' in filename.lower():
-        if 'Http(' in content or 'HttpRequest' in content:
+        if makes_callout:
             arch_score -= 15
-            CATEGORIES['architecture']['issues'].append('❌ Synchronous callout in trigger (must use async)')
+            architecture_issues.append('❌ Synchronous callout in trigger (must use async)')
 
     CATEGORIES['architecture']['score'] = max(0, arch_score)
 
@@ -147,14 +226,14 @@ def validate_apex_file(content: str, filename: str) -> None:
 
     # Check for logging
     if 'System.debug' in content:
-        CATEGORIES['best_practices']['issues'].append('✅ Debug logging present')
+        best_practices_issues.append('✅ Debug logging present')
     else:
         bp_score -= 5
-        CATEGORIES['best_practices']['issues'].append('⚠️ No debug logging')
+        best_practices_issues.append('⚠️ No debug logging')
 
     # Check for proper HTTP methods
-    if re.search(r'setMethod\s*\(\s*[\'"](?:GET|POST|PUT|PATCH|DELETE)[\'"]\s*\)', content):
-        CATEGORIES['best_practices']['issues'].append('✅ Standard HTTP method used')
+    if HTTP_METHOD_PATTERN.search(content):
+        best_practices_issues.append('✅ Standard HTTP method used')
 
     CATEGORIES['best_practices']['score'] = max(0, bp_score)
 
@@ -163,14 +242,14 @@ def validate_apex_file(content: str, filename: str) -> None:
 
     # Check for ApexDoc
     if '/**' in content and '@description' in content:
-        CATEGORIES['documentation']['issues'].append('✅ ApexDoc present')
+        documentation_issues.append('✅ ApexDoc present')
     else:
         doc_score -= 5
-        CATEGORIES['documentation']['issues'].append('⚠️ Missing ApexDoc comments')
+        documentation_issues.append('⚠️ Missing ApexDoc comments')
 
     # Check for class-level documentation
-    if re.search(r'/\*\*[\s\S]*?\*/\s*public\s+(with sharing\s+)?class', content):
-        CATEGORIES['documentation']['issues'].append('✅ Class-level documentation')
+    if CLASS_DOC_PATTERN.search(content):
+        documentation_issues.append('✅ Class-level documentation')
 
     CATEGORIES['documentation']['score'] = max(0, doc_score)
 
@@ -178,24 +257,29 @@ def validate_apex_file(content: str, filename: str) -> None:
 def validate_named_credential(content: str) -> None:
     """Validate Named Credential XML."""
 
+    # Local handles on each category's issue list
+    security_issues = CATEGORIES['security']['issues']
+    best_practices_issues = CATEGORIES['best_practices']['issues']
+
     # Security checks
     security_score = 30
 
     # Check for hardcoded password in XML (should never be there)
-    if '<password>' in content and re.search(r'<password>[^<]+</password>', content):
-        password_value = re.search(r'<password>([^<]+)</password>', content)
+    if '<password>' in content:
+        password_value = XML_PASSWORD_PATTERN.search(content)
         if password_value and len(password_value.group(1)) > 0:
             security_score -= 15
-            CATEGORIES['security']['issues'].append('⚠️ Password value in metadata (should be empty, set via UI)')
-
-    # Check for protocol
-    if '<protocol>Oauth</protocol>' in content:
-        CATEGORIES['security']['issues'].append('✅ OAuth authentication configured')
-    elif '<protocol>Password</protocol>' in content:
-        CATEGORIES['security']['issues'].append('✅ Password authentication configured')
+            security_issues.append('⚠️ Password value in metadata (should be empty, set via UI)')
+
+    # Check for protocol (one scan collects every declared value)
+    protocols = set(PROTOCOL_PATTERN.findall(content))
+    if 'Oauth' in protocols:
+        security_issues.append('✅ OAuth authentication configured')
+    elif 'Password' in protocols:
+        security_issues.append('✅ Password authentication configured')
         security_score -= 5  # OAuth preferred over password
-    elif '<protocol>NoAuthentication</protocol>' in content:
-        CATEGORIES['security']['issues'].append('⚠️ No authentication (verify this is intentional)')
+    elif 'NoAuthentication' in protocols:
+        security_issues.append('⚠️ No authentication (verify this is intentional)')
         security_score -= 10
 
     CATEGORIES['security']['score'] = max(0, security_score)
@@ -204,10 +288,10 @@ def validate_named_credential(content: str) -> None:
     bp_score = 15
 
     if '<allowMergeFieldsInBody>true</allowMergeFieldsInBody>' in content:
-        CATEGORIES['best_practices']['issues'].append('✅ Merge fields in body enabled')
+        best_practices_issues.append('✅ Merge fields in body enabled')
 
     if '<allowMergeFieldsInHeader>true</allowMergeFieldsInHeader>' in content:
-        CATEGORIES['best_practices']['issues'].append('✅ Merge fields in header enabled')
+        best_practices_issues.append('✅ Merge fields in header enabled')
 
     CATEGORIES['best_practices']['score'] = bp_score
 
@@ -215,23 +299,144 @@ def validate_named_credential(content: str) -> None:
 def validate_platform_event(content: str) -> None:
     """Validate Platform Event definition."""
 
+    # Local handles on each category's issue list
+    architecture_issues = CATEGORIES['architecture']['issues']
+    best_practices_issues = CATEGORIES['best_practices']['issues']
+
     # Check event type
-    if '<eventType>HighVolume</eventType>' in content:
-        CATEGORIES['best_practices']['issues'].append('✅ High Volume event type')
+    event_types = set(EVENT_TYPE_PATTERN.findall(content))
+    if 'HighVolume' in event_types:
+        best_practices_issues.append('✅ High Volume event type')
         CATEGORIES['best_practices']['score'] = 15
-    elif '<eventType>StandardVolume</eventType>' in content:
-        CATEGORIES['best_practices']['issues'].append('✅ Standard Volume event type')
+    elif 'StandardVolume' in event_types:
+        best_practices_issues.append('✅ Standard Volume event type')
         CATEGORIES['best_practices']['score'] = 15
 
     # Check publish behavior
-    if '<publishBehavior>PublishAfterCommit</publishBehavior>' in content:
-        CATEGORIES['architecture']['issues'].append('✅ PublishAfterCommit (recommended)')
+    publish_behaviors = set(PUBLISH_BEHAVIOR_PATTERN.findall(content))
+    if 'PublishAfterCommit' in publish_behaviors:
+        architecture_issues.append('✅ PublishAfterCommit (recommended)')
         CATEGORIES['architecture']['score'] = 20
-    elif '<publishBehavior>PublishImmediately</publishBehavior>' in content:
-        CATEGORIES['architecture']['issues'].append('⚠️ PublishImmediately (verify this is intentional)')
+    elif 'PublishImmediately' in publish_behaviors:
+        architecture_issues.append('⚠️ PublishImmediately (verify this is intentional)')
         CATEGORIES['architecture']['score'] = 15
 
 
+def get_cache_file(filename: str, raw: bytes) -> Path:
+    """Return the cache entry path for this file name, raw file bytes and script version."""
+    # The cache modules are imported only once a file is accepted, keeping
+    # them off the skip path that most PostToolUse writes take
+    import hashlib
+    script_mtime = os.stat(__file__).st_mtime_ns
+    digest = hashlib.sha1(f'{script_mtime}\0{filename}\0'.encode('utf-8'))
+    digest.update(raw)
+    return CACHE_DIR / f'{digest.hexdigest()}.json'
+
+
+def load_cached_scores(cache_file: Path) -> bool:
+    """Load cached category scores into CATEGORIES. Returns True on a cache hit."""
+    import json
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    # Anything but a complete entry as written by save_cached_scores() - e.g.
+    # truncated or hand-edited - is treated as a miss and rescanned
+    try:
+        entries = {name: (cached[name]['score'], cached[name]['issues']) for name in CATEGORIES}
+    except (TypeError, KeyError):
+        return False
+    if not all(isinstance(score, int) and isinstance(issues, list) for score, issues in entries.values()):
+        return False
+
+    # Mark the entry as recently used so pruning keeps it
+    try:
+        os.utime(cache_file)
+    except OSError:
+        pass
+
+    for cat_name, (score, issues) in entries.items():
+        CATEGORIES[cat_name]['score'] = score
+        CATEGORIES[cat_name]['issues'] = issues
+    return True
+
+
+def prune_cache(cache_dir: Path) -> None:
+    """Delete the least recently used cache entries beyond CACHE_MAX_ENTRIES."""
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.json'):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                    except OSError:
+                        pass
+    except OSError:
+        return
+
+    if len(entries) <= CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - CACHE_MAX_ENTRIES]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def save_cached_scores(cache_file: Path) -> None:
+    """Persist CATEGORIES scores. Failures are ignored - the cache is best effort."""
+    import json
+    import tempfile
+    tmp_path = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({name: {'score': data['score'], 'issues': data['issues']}
+                       for name, data in CATEGORIES.items()}, f)
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        if tmp_path:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        return
+
+    # Only misses write, so the directory listing stays off the hit path
+    prune_cache(cache_file.parent)
+
+
+def validate_with_cache(filename: str, raw: bytes, validator, *args) -> None:
+    """Run validator(*args) unless scores for this exact file content are cached."""
+    cache_file = get_cache_file(filename, raw)
+    if not load_cached_scores(cache_file):
+        validator(*args)
+        save_cached_scores(cache_file)
+
+
+def get_file_type(filename: str) -> str:
+    """
+    Classify a file by name as 'apex', 'named_credential' or 'platform_event'.
+
+    Returns '' for files we don't validate. Checks run cheapest first, and
+    only .xml names are lowercased, so most files are rejected before any
+    string copy - and before the file is read at all.
+    """
+    if filename.endswith(APEX_SUFFIXES):
+        return 'apex'
+    suffix_len = len(XML_SUFFIX)
+    if filename[-suffix_len:].lower() == XML_SUFFIX and NAMED_CRED_MARKER in filename[:-suffix_len].lower():
+        return 'named_credential'
+    if PLATFORM_EVENT_MARKER in filename:
+        return 'platform_event'
+    return ''
+
+
 def calculate_total_score() -> int:
     """Calculate total score from all categories."""
     return sum(cat['score'] for cat in CATEGORIES.values())
@@ -252,90 +457,117 @@ def get_rating(score: int) -> str:
         return '⭐ Critical'
 
 
-def print_score_report(filename: str) -> None:
-    """Print formatted score report."""
+def print_score_report(filename: str = '') -> None:
+    """
+    Print formatted score report (assembled first, written in one call).
+
+    The file name heads the report when given - used when validating a batch.
+    """
     total = calculate_total_score()
     rating = get_rating(total)
 
-    print(f'\n📊 INTEGRATION SCORE: {total}/{MAX_SCORE} {rating}')
-    print('═' * 50)
-
-    category_icons = {
-        'security': '🔐',
-        'error_handling': '⚠️',
-        'bulkification': '📦',
-        'architecture': '🏗️',
-        'best_practices': '✅',
-        'documentation': '📝'
-    }
+    lines = [f'\n📄 {filename}'] if filename else []
+    lines.append(f'\n📊 INTEGRATION SCORE: {total}/{MAX_SCORE} {rating}')
+    lines.append('═' * 50)
 
     for cat_name, cat_data in CATEGORIES.items():
-        icon = category_icons.get(cat_name, '•')
+        icon = CATEGORY_ICONS.get(cat_name, '•')
         max_score = cat_data['max']
         score = cat_data['score']
         pct = (score / max_score * 100) if max_score > 0 else 0
         bar = '█' * int(pct / 10) + '░' * (10 - int(pct / 10))
 
-        print(f'\n{icon} {cat_name.replace("_", " ").title():18} {score:2}/{max_score:2}  {bar} {pct:.0f}%')
-
-        for issue in cat_data['issues']:
-            print(f'   {issue}')
+        lines.append(f'\n{icon} {CATEGORY_LABELS[cat_name]:18} {score:2}/{max_score:2}  {bar} {pct:.0f}%')
+        lines.extend(f'   {issue}' for issue in cat_data['issues'])
 
-    print('\n' + '═' * 50)
+    lines.append('\n' + '═' * 50)
 
     if total < 54:
-        print('🚫 DEPLOYMENT BLOCKED - Score below 45% threshold')
+        lines.append('🚫 DEPLOYMENT BLOCKED - Score below 45% threshold')
     elif total < 72:
-        print('⚠️ WARNING - Review issues before deployment')
+        lines.append('⚠️ WARNING - Review issues before deployment')
     else:
-        print('✅ PASSED - Ready for deployment')
+        lines.append('✅ PASSED - Ready for deployment')
 
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-def main():
-    if len(sys.argv) < 2:
-        print('Usage: validate_integration.py <file_path>')
-        sys.exit(1)
 
-    file_path = sys.argv[1]
+def reset_scores() -> None:
+    """Clear CATEGORIES so the next file in a batch starts from zero."""
+    for cat_data in CATEGORIES.values():
+        cat_data['score'] = 0
+        cat_data['issues'] = []
 
+
+def validate_file(file_path: str, show_filename: bool = False) -> int:
+    """Validate a single file and print its report. Returns the exit code for it."""
     # Skip non-integration files
     if not file_path:
-        sys.exit(0)
+        return 0
 
     filename = os.path.basename(file_path)
 
-    # Determine file type and validate
+    # Determine file type from the name alone before reading anything
+    file_type = get_file_type(filename)
+    if not file_type:
+        # Not an integration file we validate
+        return 0
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Read bytes once: the cache key hashes them directly, so the decoded
+        # text never has to be re-encoded
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        content = raw.decode('utf-8')
     except Exception as e:
         print(f'Error reading file: {e}')
-        sys.exit(1)
+        return 1
+
+    # Same newline handling as reading in text mode
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
 
     # Skip if file is too small (likely not a real integration file)
     if len(content) < 50:
-        sys.exit(0)
+        return 0
 
     # Skip template files (contain placeholders)
     if '{{' in content and '}}' in content:
         print(f'ℹ️ Skipping template file: {filename}')
-        sys.exit(0)
+        return 0
+
+    reset_scores()
 
     # Validate based on file type
-    if APEX_PATTERN.search(filename):
+    if file_type == 'apex':
         # Only validate if it looks like integration code
         if any(keyword in content for keyword in ['HttpRequest', 'Http(', 'callout:', 'EventBus', 'ChangeEvent']):
-            validate_apex_file(content, filename)
-            print_score_report(filename)
-    elif NAMED_CRED_PATTERN.search(filename):
-        validate_named_credential(content)
-        print_score_report(filename)
-    elif '__e.object-meta.xml' in filename:
-        validate_platform_event(content)
-        print_score_report(filename)
+            validate_with_cache(filename, raw, validate_apex_file, content, filename)
+            print_score_report(file_path if show_filename else '')
+    elif file_type == 'named_credential':
+        validate_with_cache(filename, raw, validate_named_credential, content)
+        print_score_report(file_path if show_filename else '')
     else:
-        # Not an integration file we validate
-        sys.exit(0)
+        validate_with_cache(filename, raw, validate_platform_event, content)
+        print_score_report(file_path if show_filename else '')
+
+    return 0
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: validate_integration.py <file_path> [<file_path> ...]')
+        sys.exit(1)
+
+    # Several paths can be validated in one run to avoid paying interpreter
+    # startup per file; each report is then labelled with its path
+    file_paths = sys.argv[1:]
+    show_filename = len(file_paths) > 1
+
+    exit_code = 0
+    for file_path in file_paths:
+        exit_code = max(exit_code, validate_file(file_path, show_filename))
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
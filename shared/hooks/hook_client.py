@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Thin UserPromptSubmit hook client for skill-activation-prompt.py
+
+Forwards the hook JSON to a long-running skill-activation-prompt.py server
+over a Unix socket, so each prompt only pays for this small script instead
+of loading and compiling the skills registry again.
+
+If no server is listening, one is started in the background (it exits
+after 30 idle minutes) and this prompt is answered in-process, so the hook
+output is the same either way.
+
+Installation:
+Use in place of skill-activation-prompt.py in .claude/hooks.json:
+{
+  "hooks": {
+    "UserPromptSubmit": [
+      {
+        "type": "command",
+        "command": "python3 ./shared/hooks/hook_client.py",
+        "timeout": 5000
+      }
+    ]
+  }
+}
+"""
+
+import socket
+import subprocess
+import sys
+import zlib
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+SERVER_SCRIPT = SCRIPT_DIR / "skill-activation-prompt.py"
+# Must match SOCKET_FILE in skill-activation-prompt.py (one socket per checkout)
+SOCKET_FILE = Path.home() / ".cache" / "sf-skills" / (
+    f"skill-activation-{zlib.crc32(str(SCRIPT_DIR.resolve()).encode()):08x}.sock"
+)
+SOCKET_TIMEOUT = 2  # Seconds, well inside the hook's 5s budget
+
+
+def ask_server(request: bytes) -> bytes:
+    """Send one request line to the server and return its reply line."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(SOCKET_TIMEOUT)
+        conn.connect(str(SOCKET_FILE))
+        conn.sendall(request)
+        with conn.makefile("rb") as reply:
+            line = reply.readline()
+    if not line.endswith(b"\n"):
+        raise ConnectionError("incomplete reply from skill suggestion server")
+    return line
+
+
+def start_server():
+    """Start a detached socket server for the following prompts."""
+    try:
+        subprocess.Popen(
+            [sys.executable, str(SERVER_SCRIPT), "--serve", "--socket", str(SOCKET_FILE)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError:
+        pass
+
+
+def answer_in_process(request: bytes) -> bytes:
+    """Answer the request by loading skill-activation-prompt.py directly."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("skill_activation_prompt", SERVER_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.handle_request_line(request.decode("utf-8")).encode("utf-8")
+
+
+def main():
+    """Main entry point for the UserPromptSubmit hook."""
+    raw = sys.stdin.buffer.read()
+    if not raw.strip():
+        sys.exit(0)
+
+    # Raw newlines in JSON can only be whitespace, so this keeps it one line
+    request = raw.replace(b"\r", b" ").replace(b"\n", b" ") + b"\n"
+
+    try:
+        reply = ask_server(request)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No server yet - start one and answer this prompt ourselves
+        start_server()
+        reply = answer_in_process(request)
+    except OSError:
+        # Server is busy, wedged or exiting after an upgrade - answer this prompt ourselves
+        reply = answer_in_process(request)
+
+    # "{}" means no suggestions - exit silently like the direct hook
+    if reply.strip() != b"{}":
+        sys.stdout.buffer.write(reply)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -34,85 +34,369 @@ Add to .claude/hooks.json in project root:
 
 Input: JSON via stdin with { "prompt": "user message", "activeFiles": [...] }
 Output: JSON with { "output_message": "..." } for skill suggestions
+
+Server mode:
+  --serve                 Read one hook JSON per line on stdin, write one
+                          JSON reply per line ({} when nothing to suggest)
+  --serve --socket PATH   Same protocol over a Unix socket; hook_client.py
+                          forwards each hook invocation to it, so interpreter
+                          startup and registry loading happen once
 """
 
+import fnmatch
+import functools
+import heapq
 import json
+import os
+import pickle
 import re
 import sys
+import zlib
 from pathlib import Path
 from typing import Optional
 
+try:
+    # Optional: single-pass keyword matching across all skills
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Configuration
 MAX_SUGGESTIONS = 3  # Maximum number of skills to suggest
 MIN_SCORE_THRESHOLD = 2  # Minimum score needed to suggest a skill
 KEYWORD_SCORE = 2  # Score for keyword match
 INTENT_PATTERN_SCORE = 3  # Score for intent pattern match
 FILE_PATTERN_SCORE = 2  # Score for file pattern match
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}  # Tie-break for equal scores
+
+# Marks a file pattern as a glob ("glob:lwc/*/*.js"); unmarked patterns are regexes
+GLOB_PREFIX = "glob:"
+
+# Suggestion box dividers, built once rather than on every prompt
+_DIV_HEAVY = "═" * 54
+_DIV_LIGHT = "─" * 54
 
 # Script directory for loading registry
 SCRIPT_DIR = Path(__file__).parent
 REGISTRY_FILE = SCRIPT_DIR / "skills-registry.json"
 
+# Preprocessed registry pickled across hook runs, keyed by registry_cache_key().
+# One file per registry path, so separate checkouts don't keep overwriting each other
+CACHE_FILE = Path.home() / ".cache" / "sf-skills" / (
+    f"skills-registry-{zlib.crc32(str(REGISTRY_FILE.resolve()).encode()):08x}.pkl"
+)
+# One socket per checkout, so each install is answered by its own code and registry
+SOCKET_FILE = CACHE_FILE.with_name(
+    f"skill-activation-{zlib.crc32(str(SCRIPT_DIR.resolve()).encode()):08x}.sock"
+)
+SERVER_IDLE_SECONDS = 30 * 60  # Socket server exits after this long without a request
+
 # Cache for registry
 _registry_cache: Optional[dict] = None
+_registry_key: Optional[tuple] = None
+
+
+def compile_patterns(patterns: list, flags: int = 0) -> list:
+    """Compile regex strings, silently skipping invalid ones."""
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern, flags))
+        except re.error:
+            # Skip invalid regex patterns
+            continue
+    return compiled
+
+
+def is_glob_pattern(pattern: str) -> bool:
+    """
+    Tell glob file patterns from regexes without guessing.
+
+    A glob carries the GLOB_PREFIX or starts with "*" ("*.cls"), which no
+    valid regex can. Everything else stays a regex, so patterns such as
+    "tests?" or "[Tt]rigger" keep their regex meaning.
+    """
+    return pattern.startswith(GLOB_PREFIX) or pattern.startswith("*")
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Translate a glob file pattern to a regex anchored at both ends, so
+    search() only accepts whole-path matches, as fnmatch would.
+    """
+    if pattern.startswith(GLOB_PREFIX):
+        pattern = pattern[len(GLOB_PREFIX):]
+    return rf"\A{fnmatch.translate(pattern)}"
+
+
+def compile_file_patterns(patterns: list) -> list:
+    """Compile file patterns, accepting globs (see is_glob_pattern) alongside regexes."""
+    return compile_patterns(
+        [glob_to_regex(p) if is_glob_pattern(p) else p for p in patterns],
+        re.IGNORECASE
+    )
+
+
+def compile_keyword_union(keywords: list) -> Optional[re.Pattern]:
+    """
+    Compile a skill's keywords into a single alternation regex.
+
+    Match whole words to avoid false positives
+    e.g., "class" shouldn't match "classification"
+
+    The alternation sits in a lookahead so matches don't consume text and
+    overlapping keywords ("test class" / "class") are each reported.
+    Longest keywords are tried first; a shorter keyword sharing the same
+    start is re-checked by match_keywords().
+    """
+    if not keywords:
+        return None
+    alternatives = sorted(set(keywords), key=len, reverse=True)
+    return re.compile(r'(?=\b(' + '|'.join(re.escape(kw) for kw in alternatives) + r')\b)')
+
+
+def compile_chain_phrases(chains: dict) -> list:
+    """
+    Lowercase every chain's trigger phrases once, at registry load.
+
+    Returns [(phrase, chain_name)] in registry order, so the first hit
+    is the chain the prompt triggers.
+    """
+    return [
+        (phrase.lower(), chain_name)
+        for chain_name, chain_config in chains.items()
+        for phrase in chain_config.get("trigger_phrases", [])
+    ]
+
+
+def compile_registry(registry: dict) -> dict:
+    """
+    Precompile every skill's matching regexes once, at registry load.
+
+    Compiled patterns are stored on each skill config under "_"-prefixed
+    keys so matching a prompt never builds or compiles a pattern.
+    """
+    skills = registry.get("skills", {})
+    for config in skills.values():
+        config["_keywords"] = [kw.lower() for kw in config.get("keywords", [])]
+        config["_intent_patterns"] = compile_patterns(config.get("intentPatterns", []), re.IGNORECASE)
+        config["_file_patterns"] = compile_file_patterns(config.get("filePatterns", []))
+        # Best score the skill could reach, used to prune it from the top-K search
+        config["_max_score"] = (
+            KEYWORD_SCORE * min(len(config["_keywords"]), 3)
+            + (INTENT_PATTERN_SCORE if config["_intent_patterns"] else 0)
+            + (FILE_PATTERN_SCORE if config["_file_patterns"] else 0)
+        )
+        config["_priority_rank"] = PRIORITY_ORDER.get(config.get("priority", "medium"), 1)
+
+    # Visit high-priority skills first so they raise the pruning cutoff sooner;
+    # the registry index is kept because it breaks ties between equal matches
+    registry["_skill_order"] = sorted(
+        enumerate(skills),
+        key=lambda item: skills[item[1]]["_priority_rank"]
+    )
+
+    registry["_kw_automaton"] = build_keyword_automaton(skills)
+    if registry["_kw_automaton"] is None:
+        # Keyword unions are only needed without the automaton
+        for config in skills.values():
+            config["_kw_union"] = compile_keyword_union(config["_keywords"])
+
+    registry["_chain_phrases"] = compile_chain_phrases(registry.get("chains", {}))
+    registry["_chain_automaton"] = build_chain_automaton(registry["_chain_phrases"])
+    return registry
+
+
+def build_keyword_automaton(skills: dict):
+    """
+    Build one Aho-Corasick automaton over every skill's keywords.
+
+    Each keyword maps to the skills that list it. Returns None when
+    pyahocorasick isn't installed, so callers use the regex path.
+    """
+    if ahocorasick is None:
+        return None
+
+    owners = {}
+    for skill_name, config in skills.items():
+        for kw in config["_keywords"]:
+            if kw:
+                owners.setdefault(kw, []).append(skill_name)
+
+    if not owners:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for kw, skill_names in owners.items():
+        automaton.add_word(kw, (kw, tuple(skill_names)))
+    automaton.make_automaton()
+    return automaton
+
+
+def build_chain_automaton(chain_phrases: list):
+    """
+    Build an Aho-Corasick automaton over the chains' trigger phrases.
+
+    Each phrase maps to the position of the first chain listing it, so the
+    lowest position seen in a prompt is the chain detect_chain() returns.
+    Returns None without pyahocorasick, or when a phrase is empty (it
+    matches every prompt and can't be added), so callers scan the list.
+    """
+    if ahocorasick is None or not chain_phrases:
+        return None
+    if any(not phrase for phrase, _ in chain_phrases):
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for position, (phrase, chain_name) in enumerate(chain_phrases):
+        if phrase not in automaton:
+            automaton.add_word(phrase, (position, chain_name))
+    automaton.make_automaton()
+    return automaton
+
+
+def registry_cache_key() -> tuple:
+    """Identify the registry JSON, this script's version and pyahocorasick availability."""
+    registry_stat = os.stat(REGISTRY_FILE)
+    return (
+        str(REGISTRY_FILE.resolve()),
+        registry_stat.st_mtime_ns,
+        registry_stat.st_size,
+        os.stat(__file__).st_mtime_ns,
+        ahocorasick is not None,
+    )
+
+
+def load_cached_registry(key: tuple) -> Optional[dict]:
+    """Load the pickled registry if it was built for this key. Returns None on a miss."""
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except Exception:
+        # Missing, corrupt or incompatible cache - reparse the JSON
+        return None
+
+
+def save_cached_registry(key: tuple, registry: dict) -> None:
+    """Pickle the preprocessed registry. Failures are ignored - the cache is best effort."""
+    # Only cache misses write, so keep tempfile's import cost off the hit path
+    import tempfile
+    try:
+        CACHE_FILE.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_FILE.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(key, f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(registry, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, CACHE_FILE)
+    except (OSError, pickle.PicklingError):
+        pass
 
 
 def load_registry() -> dict:
     """Load skills registry from JSON config with caching."""
-    global _registry_cache
+    global _registry_cache, _registry_key
+    if _registry_cache is not None:
+        return _registry_cache
+
+    try:
+        key = registry_cache_key()
+    except OSError:
+        # Silent fail - don't break user experience
+        return {"skills": {}, "chains": {}}
+    _registry_key = key
+
+    _registry_cache = load_cached_registry(key)
     if _registry_cache is not None:
         return _registry_cache
 
     try:
         with open(REGISTRY_FILE, "r") as f:
-            _registry_cache = json.load(f)
-            return _registry_cache
+            _registry_cache = compile_registry(json.load(f))
     except (FileNotFoundError, json.JSONDecodeError) as e:
         # Silent fail - don't break user experience
         return {"skills": {}, "chains": {}}
 
+    save_cached_registry(key, _registry_cache)
+    return _registry_cache
+
+
+def refresh_registry():
+    """
+    Drop the loaded registry and memoized matches if the registry JSON or
+    this script changed, so a long-running server picks up edits.
+    """
+    global _registry_cache
+    try:
+        key = registry_cache_key()
+    except OSError:
+        key = None
+    if key != _registry_key:
+        _registry_cache = None
+        match_prompt.cache_clear()
+
 
-def match_keywords(prompt: str, keywords: list) -> int:
+def match_keywords(prompt_lower: str, keywords: list, kw_union: Optional[re.Pattern]) -> int:
     """
-    Check if any keyword appears in prompt.
+    Check which keywords appear in the lowercased prompt with one scan.
     Returns the number of unique keyword matches.
     """
-    prompt_lower = prompt.lower()
-    matches = 0
+    if kw_union is None:
+        return 0
+
+    found = {m.group(1) for m in kw_union.finditer(prompt_lower)}
+    if not found:
+        return 0
+
+    # A keyword that is a prefix of a longer match at the same position
+    # ("apex" in "apex test") is shadowed by it; check those directly
     for kw in keywords:
-        # Match whole words to avoid false positives
-        # e.g., "class" shouldn't match "classification"
-        pattern = rf'\b{re.escape(kw.lower())}\b'
-        if re.search(pattern, prompt_lower):
-            matches += 1
-    return matches
+        if kw not in found and any(hit.startswith(kw) for hit in found):
+            if re.search(rf'\b{re.escape(kw)}\b', prompt_lower):
+                found.add(kw)
 
+    return sum(1 for kw in keywords if kw in found)
 
-def match_intent_patterns(prompt: str, patterns: list) -> bool:
-    """Check if any intent pattern matches prompt."""
-    prompt_lower = prompt.lower()
-    for pattern in patterns:
-        try:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return True
-        except re.error:
-            # Skip invalid regex patterns
+
+def is_word_char(ch: str) -> bool:
+    """Same definition of a word character as regex \\w."""
+    return ch.isalnum() or ch == "_"
+
+
+def find_keyword_hits(prompt_lower: str, automaton) -> dict:
+    """
+    Scan the lowercased prompt once for every skill's keywords.
+    Returns {skill_name: set of matched keywords}.
+    """
+    hits = {}
+    last = len(prompt_lower) - 1
+    for end, (kw, skill_names) in automaton.iter(prompt_lower):
+        start = end - len(kw) + 1
+        # Keep whole-word semantics of \b...\b
+        before = start > 0 and is_word_char(prompt_lower[start - 1])
+        after = end < last and is_word_char(prompt_lower[end + 1])
+        if before == is_word_char(kw[0]) or after == is_word_char(kw[-1]):
             continue
-    return False
+        for skill_name in skill_names:
+            hits.setdefault(skill_name, set()).add(kw)
+    return hits
+
+
+def match_intent_patterns(prompt_lower: str, patterns: list) -> bool:
+    """Check if any intent pattern matches the lowercased prompt."""
+    return any(pattern.search(prompt_lower) for pattern in patterns)
 
 
 def match_file_pattern(active_files: list, file_patterns: list) -> bool:
-    """Check if any active file matches the file patterns."""
+    """Check if any active file matches the compiled file patterns."""
     if not active_files or not file_patterns:
         return False
 
     for pattern in file_patterns:
-        try:
-            for f in active_files:
-                if re.search(pattern, f, re.IGNORECASE):
-                    return True
-        except re.error:
-            continue
+        for f in active_files:
+            if pattern.search(f):
+                return True
 
     return False
 
@@ -120,20 +404,34 @@ def match_file_pattern(active_files: list, file_patterns: list) -> bool:
 def detect_chain(prompt: str, registry: dict) -> Optional[dict]:
     """Detect if the prompt matches an orchestration chain."""
     prompt_lower = prompt.lower()
-    chains = registry.get("chains", {})
-
-    for chain_name, chain_config in chains.items():
-        trigger_phrases = chain_config.get("trigger_phrases", [])
-        for phrase in trigger_phrases:
-            if phrase.lower() in prompt_lower:
-                return {
-                    "name": chain_name,
-                    "description": chain_config.get("description", ""),
-                    "order": chain_config.get("order", []),
-                    "first_skill": chain_config.get("order", [""])[0]
-                }
-
-    return None
+    automaton = registry["_chain_automaton"]
+
+    chain_name = None
+    if automaton is not None:
+        # The first chain in registry order wins, not the leftmost phrase,
+        # so keep the lowest-positioned phrase found anywhere in the prompt
+        best = None
+        for _, (position, name) in automaton.iter(prompt_lower):
+            if best is None or position < best:
+                best, chain_name = position, name
+                if best == 0:
+                    break
+    else:
+        for phrase, name in registry["_chain_phrases"]:
+            if phrase in prompt_lower:
+                chain_name = name
+                break
+
+    if chain_name is None:
+        return None
+
+    chain_config = registry["chains"][chain_name]
+    return {
+        "name": chain_name,
+        "description": chain_config.get("description", ""),
+        "order": chain_config.get("order", []),
+        "first_skill": chain_config.get("order", [""])[0]
+    }
 
 
 def find_matching_skills(prompt: str, active_files: list, registry: dict) -> list:
@@ -141,29 +439,58 @@ def find_matching_skills(prompt: str, active_files: list, registry: dict) -> lis
     Find all skills that match the prompt or active files.
     Returns list of matches sorted by score.
     """
-    matches = []
     skills = registry.get("skills", {})
+    prompt_lower = prompt.lower()
+
+    automaton = registry.get("_kw_automaton")
+    keyword_hits = find_keyword_hits(prompt_lower, automaton) if automaton is not None else None
+
+    # Min-heap of the best matches so far, weakest on top. Keys order matches
+    # like the final ranking: score, then priority, then registry order.
+    top = []
+
+    for index, skill_name in registry.get("_skill_order", []):
+        config = skills[skill_name]
+        rank = config["_priority_rank"]
+        intent_patterns = config["_intent_patterns"]
+        file_patterns = config["_file_patterns"]
+        file_bonus = FILE_PATTERN_SCORE if file_patterns and active_files else 0
+
+        # Skip skills that can't reach the threshold or beat the current K-th match
+        max_score = config["_max_score"]
+        if file_patterns and not active_files:
+            max_score -= FILE_PATTERN_SCORE
+        if max_score < MIN_SCORE_THRESHOLD:
+            continue
+        if len(top) == MAX_SUGGESTIONS and (max_score, -rank, -index) < top[0][0]:
+            continue
 
-    for skill_name, config in skills.items():
         score = 0
         match_reasons = []
 
         # Keyword matching (multiple matches add to score)
-        keywords = config.get("keywords", [])
-        keyword_matches = match_keywords(prompt, keywords)
+        if keyword_hits is not None:
+            found = keyword_hits.get(skill_name, ())
+            keyword_matches = sum(1 for kw in config.get("_keywords", []) if kw in found)
+        else:
+            keyword_matches = match_keywords(prompt_lower, config.get("_keywords", []), config.get("_kw_union"))
         if keyword_matches > 0:
             score += KEYWORD_SCORE * min(keyword_matches, 3)  # Cap at 3x
             match_reasons.append(f"{keyword_matches} keyword(s)")
 
+        # Once the list is full, the remaining checks only run while they could
+        # still lift the skill into it; intent regexes are the most expensive part
+        full = len(top) == MAX_SUGGESTIONS
+        if full and intent_patterns and (score + INTENT_PATTERN_SCORE + file_bonus, -rank, -index) < top[0][0]:
+            continue
+
         # Intent pattern matching (adds to score)
-        intent_patterns = config.get("intentPatterns", [])
-        if match_intent_patterns(prompt, intent_patterns):
+        if match_intent_patterns(prompt_lower, intent_patterns):
             score += INTENT_PATTERN_SCORE
             match_reasons.append("intent match")
 
         # File pattern matching (adds to score)
-        file_patterns = config.get("filePatterns", [])
-        if file_patterns and active_files:
+        if file_bonus and not (full and (score + file_bonus, -rank, -index) < top[0][0]):
             if match_file_pattern(active_files, file_patterns):
                 score += FILE_PATTERN_SCORE
                 match_reasons.append("file match")
@@ -178,7 +505,7 @@ def find_matching_skills(prompt: str, active_files: list, registry: dict) -> lis
             else:
                 confidence = 1  # OPTIONAL
 
-            matches.append({
+            entry = ((score, -rank, -index), {
                 "skill": skill_name,
                 "score": score,
                 "confidence": confidence,
@@ -186,15 +513,13 @@ def find_matching_skills(prompt: str, active_files: list, registry: dict) -> lis
                 "description": config.get("description", ""),
                 "reasons": match_reasons
             })
+            if len(top) < MAX_SUGGESTIONS:
+                heapq.heappush(top, entry)
+            elif entry[0] > top[0][0]:
+                heapq.heapreplace(top, entry)
 
     # Sort by score (descending), then by priority
-    priority_order = {"high": 0, "medium": 1, "low": 2}
-    matches.sort(key=lambda x: (
-        -x["score"],
-        priority_order.get(x["priority"], 1)
-    ))
-
-    return matches[:MAX_SUGGESTIONS]
+    return [match for _, match in sorted(top, key=lambda entry: entry[0], reverse=True)]
 
 
 def format_suggestions(matches: list, chain: Optional[dict], registry: dict) -> str:
@@ -208,9 +533,9 @@ def format_suggestions(matches: list, chain: Optional[dict], registry: dict) ->
         "1": {"icon": "*", "label": "OPTIONAL"}
     })
 
-    lines = [f"{'═' * 54}"]
+    lines = [_DIV_HEAVY]
     lines.append("💡 SKILL SUGGESTIONS (based on your request)")
-    lines.append(f"{'═' * 54}")
+    lines.append(_DIV_HEAVY)
 
     # Show chain detection if found
     if chain:
@@ -243,44 +568,29 @@ def format_suggestions(matches: list, chain: Optional[dict], registry: dict) ->
         if description:
             lines.append(f"   └─ {description}")
 
-    lines.append(f"{'─' * 54}")
+    lines.append(_DIV_LIGHT)
     lines.append("💡 Invoke with /skill-name or ask Claude to use it")
-    lines.append(f"{'═' * 54}")
+    lines.append(_DIV_HEAVY)
 
     return "\n".join(lines)
 
 
-def main():
-    """Main entry point for the UserPromptSubmit hook."""
-    try:
-        # Read hook input from stdin
-        input_data = json.load(sys.stdin)
-    except (json.JSONDecodeError, EOFError):
-        # No input or invalid JSON - exit silently
-        sys.exit(0)
-
-    # Extract prompt and active files
-    prompt = input_data.get("prompt", "")
-    active_files = input_data.get("activeFiles", [])
-
-    # Skip if prompt is too short
-    if len(prompt.strip()) < 5:
-        sys.exit(0)
-
-    # Skip if this looks like a slash command already
-    if prompt.strip().startswith("/"):
-        sys.exit(0)
+@functools.lru_cache(maxsize=64)
+def match_prompt(prompt_lower: str, active_files: tuple) -> str:
+    """
+    Build the suggestion message for a lowercased prompt and active files.
+    Returns "" when nothing matches.
 
-    # Load skills registry
+    Matching only depends on these two values and the loaded registry, so
+    results are memoized for repeated prompts within one process.
+    """
     registry = load_registry()
-    if not registry.get("skills"):
-        sys.exit(0)
 
     # Detect if prompt matches a workflow chain
-    chain = detect_chain(prompt, registry)
+    chain = detect_chain(prompt_lower, registry)
 
     # Find matching skills
-    matches = find_matching_skills(prompt, active_files, registry)
+    matches = find_matching_skills(prompt_lower, active_files, registry)
 
     # If we detected a chain, ensure first skill is in suggestions
     if chain and chain["first_skill"]:
@@ -298,18 +608,181 @@ def main():
             })
             matches = matches[:MAX_SUGGESTIONS]
 
-    if not matches and not chain:
-        # No suggestions - exit silently
-        sys.exit(0)
+    # Format suggestions ("" when there are none)
+    return format_suggestions(matches, chain, registry)
 
-    # Format and output suggestions
-    message = format_suggestions(matches, chain, registry)
 
-    output = {
+def build_output(input_data: dict) -> Optional[dict]:
+    """
+    Build the hook output for one parsed hook input.
+    Returns None when there is nothing to suggest.
+    """
+    # Extract prompt and active files
+    prompt = input_data.get("prompt", "")
+    active_files = input_data.get("activeFiles", [])
+
+    # Skip if prompt is too short
+    if len(prompt.strip()) < 5:
+        return None
+
+    # Skip if this looks like a slash command already
+    if prompt.strip().startswith("/"):
+        return None
+
+    # Load skills registry
+    registry = load_registry()
+    if not registry.get("skills"):
+        return None
+
+    message = match_prompt(prompt.lower(), tuple(active_files or ()))
+    if not message:
+        # No suggestions
+        return None
+
+    return {
         "output_message": message
     }
 
-    print(json.dumps(output))
+
+def handle_request_line(line: str) -> str:
+    """Answer one newline-delimited hook request with one JSON reply line."""
+    try:
+        input_data = json.loads(line)
+        refresh_registry()
+        output = build_output(input_data) if isinstance(input_data, dict) else None
+    except Exception:
+        # Silent fail - a bad request must not take the server down
+        output = None
+    return json.dumps(output or {}) + "\n"
+
+
+def serve_stream(stream_in, stream_out):
+    """Serve newline-delimited hook requests until the input stream closes."""
+    for line in stream_in:
+        if not line.strip():
+            continue
+        stream_out.write(handle_request_line(line))
+        stream_out.flush()
+
+
+def private_socket_dir(directory: Path) -> bool:
+    """
+    Make sure only this user can reach sockets in directory.
+
+    mkdir's mode is ignored when the directory already exists (the registry
+    cache may have created it), so the default directory is chmodded. Other
+    directories, e.g. from --socket, are only checked, never changed.
+    """
+    try:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if directory == SOCKET_FILE.parent:
+            os.chmod(directory, 0o700)
+        st = os.stat(directory)
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def serve_socket(socket_path: Path):
+    """
+    Serve hook requests on a Unix socket, one client connection at a time,
+    until no client has connected for SERVER_IDLE_SECONDS.
+    """
+    # Only server mode needs these; keep them off the one-shot hook path
+    import fcntl
+    import socket
+
+    if not private_socket_dir(socket_path.parent):
+        return
+
+    # The server holds this lock for its whole life, so only one server per
+    # socket runs and only the lock holder ever creates or removes the socket
+    lock_fd = os.open(socket_path.with_name(socket_path.name + ".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        # Another server already owns the socket
+        os.close(lock_fd)
+        return
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        # Holding the lock means a leftover socket is stale: its server died
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
+        server.bind(str(socket_path))
+        server.listen()
+        server.settimeout(SERVER_IDLE_SECONDS)
+        script_mtime = os.stat(__file__).st_mtime_ns
+        # Compile the registry before the first request arrives
+        load_registry()
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            try:
+                upgraded = os.stat(__file__).st_mtime_ns != script_mtime
+            except OSError:
+                upgraded = True
+            if upgraded:
+                # Refreshing the registry can't reload code; exit so the next
+                # prompt starts a server running the updated script
+                conn.close()
+                break
+            # Don't let a stalled client block everyone else
+            conn.settimeout(5)
+            try:
+                with conn, conn.makefile("rw", encoding="utf-8", newline="\n") as stream:
+                    serve_stream(stream, stream)
+            except OSError:
+                pass
+    finally:
+        server.close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
+        # Released last, so the next server can't bind before this one unlinks
+        os.close(lock_fd)
+
+
+def parse_serve_args(argv: list):
+    """Parse the optional server-mode arguments."""
+    import argparse
+    parser = argparse.ArgumentParser(description="sf-skills skill suggestion hook")
+    parser.add_argument("--serve", action="store_true",
+                        help="Answer newline-delimited hook JSON requests instead of one")
+    parser.add_argument("--socket", type=Path, nargs="?", const=SOCKET_FILE,
+                        help=f"Serve on a Unix socket (default: {SOCKET_FILE})")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point for the UserPromptSubmit hook."""
+    if len(sys.argv) > 1:
+        args = parse_serve_args(sys.argv[1:])
+        if args.socket:
+            serve_socket(args.socket)
+        elif args.serve:
+            serve_stream(sys.stdin, sys.stdout)
+        sys.exit(0)
+
+    try:
+        # Read hook input from stdin
+        input_data = json.load(sys.stdin)
+    except (json.JSONDecodeError, EOFError):
+        # No input or invalid JSON - exit silently
+        sys.exit(0)
+
+    output = build_output(input_data)
+    if output is None:
+        # No suggestions - exit silently
+        sys.exit(0)
+
+    sys.stdout.write(json.dumps(output) + "\n")
     sys.exit(0)
 
 
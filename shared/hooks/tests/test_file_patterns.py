@@ -0,0 +1,53 @@
+"""
+Tests for filePatterns handling in skill-activation-prompt.py.
+
+Run from the repository root with:
+    python3 -m unittest discover -s shared/hooks/tests
+"""
+
+import importlib.util
+import unittest
+from pathlib import Path
+
+HOOK_SCRIPT = Path(__file__).resolve().parent.parent / "skill-activation-prompt.py"
+
+
+def load_hook():
+    """Import skill-activation-prompt.py, whose hyphenated name can't be imported directly."""
+    spec = importlib.util.spec_from_file_location("skill_activation_prompt", HOOK_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+hook = load_hook()
+
+
+def matches(pattern: str, path: str) -> bool:
+    return hook.match_file_pattern([path], hook.compile_file_patterns([pattern]))
+
+
+class FilePatternTests(unittest.TestCase):
+
+    def test_ambiguous_patterns_stay_regexes(self):
+        # Valid as both a regex and a glob; the regex meaning must win
+        for pattern in ("tests?", "[Tt]rigger", "lwc/*", "\\.cls$"):
+            self.assertFalse(hook.is_glob_pattern(pattern), pattern)
+
+        # Regex search semantics: a match anywhere in the path
+        self.assertTrue(matches("tests?", "force-app/tests/AccountTest.cls"))
+        self.assertTrue(matches("tests?", "src/test/foo.js"))
+        self.assertTrue(matches("[Tt]rigger", "triggers/AccountTrigger.trigger"))
+
+    def test_marked_globs_match_whole_path(self):
+        self.assertTrue(hook.is_glob_pattern("glob:lwc/*/*.js"))
+        self.assertTrue(hook.is_glob_pattern("*.cls"))
+
+        self.assertTrue(matches("glob:lwc/*/*.js", "lwc/card/card.js"))
+        self.assertFalse(matches("glob:lwc/*/*.js", "force-app/lwc/card/card.js"))
+        self.assertTrue(matches("*.cls", "force-app/classes/Account.CLS"))
+        self.assertFalse(matches("*.cls", "force-app/classes/Account.cls-meta.xml"))
+
+
+if __name__ == "__main__":
+    unittest.main()